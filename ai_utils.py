@@ -1,12 +1,62 @@
+import os
 import streamlit as st
-import google.generativeai as genai
-from PIL import Image
+from resilience import CallRejected
+from model_router import generate, get_router
+import telemetry
+import fast_math
+from answer_cache import answer_cache, cache_enabled
+from warmup import LazyResource
 
-def get_ai_response(text, language="English", model=None):
-    """Get response from Gemini"""
+# google.generativeai and PIL are imported on first use to keep cold starts fast
+
+DEGRADED_REPLY = "I'm getting a lot of questions right now. Please give me a moment and try again!"
+
+DEFAULT_MODEL_NAME = "gemini-1.5-flash"
+
+def create_model(api_key, model_name=None):
+    """Configure Gemini and return the tutoring model, or None if unavailable
+
+    Without an explicit model_name this is the shared tier router, unless
+    routing is disabled with GENIE_MODEL_ROUTING=0.
+    """
+    if not api_key:
+        return None
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        router = get_router() if model_name is None else None
+        return router or genai.GenerativeModel(model_name or DEFAULT_MODEL_NAME)
+    except Exception:
+        return None
+
+# Tutoring model for GOOGLE_API_KEY, created on first use
+gemini_model = LazyResource("gemini", lambda: create_model(os.getenv("GOOGLE_API_KEY")))
+
+def model_label(model):
+    """Short model name used to tag telemetry"""
+    name = getattr(model, "model_name", None) or type(model).__name__
+    return name.split("/")[-1]
+
+def get_ai_response(text, language="English", model=None, cache_scope=None):
+    """Get response from Gemini
+
+    cache_scope, e.g. (subject, topic, difficulty), lets near-duplicate
+    questions in the same scope and language reuse an earlier answer.
+    """
+    # Plain arithmetic and single-variable equations are answered locally
+    answer = fast_math.try_solve(text)
+    if answer is not None:
+        return fast_math.tutor_reply(answer, language)
+    
     if not model:
         return "AI model not available. Please check your GOOGLE_API_KEY."
     
+    scope = (*cache_scope, language) if cache_scope and cache_enabled() else None
+    if scope:
+        cached = answer_cache.get(scope, text)
+        if cached is not None:
+            return cached
+    
     try:
         # Enhanced tutoring prompt
         tutor_prompt = f"""
@@ -28,33 +78,51 @@ def get_ai_response(text, language="English", model=None):
         """
         
         # Generate response with specific configuration
+        import google.generativeai as genai
         generation_config = genai.types.GenerationConfig(
             max_output_tokens=300,
             temperature=0.7,
         )
         
-        response = model.generate_content(
-            tutor_prompt,
-            generation_config=generation_config
-        )
+        with telemetry.span("generate", task="chat", model=model_label(model), language=language) as span:
+            span.set(prompt_bytes=len(tutor_prompt.encode("utf-8")))
+            response = generate(
+                model,
+                tutor_prompt,
+                task="chat",
+                text=text,
+                generation_config=generation_config
+            )
         
         # Check if response was blocked or empty
         if not response.text:
             return "I'm here to help you learn! Could you rephrase your question?"
         
-        return response.text.strip()
+        reply = response.text.strip()
+        if scope:
+            answer_cache.put(scope, text, reply)
+        return reply
         
+    except CallRejected:
+        return DEGRADED_REPLY
     except Exception as e:
         return f"I'm experiencing some technical difficulties, but I'm still here to help you learn! Error: {str(e)}"
 
 def analyze_drawing(image_path, context="", model=None):
-    """Analyze mathematical drawings and provide tutoring feedback"""
+    """Analyze mathematical drawings and provide tutoring feedback
+
+    image_path may be a file path, a binary file object or a PIL image.
+    """
     if not model:
         return "AI model not available"
     
     try:
         # Upload image to Gemini
-        image = Image.open(image_path)
+        from PIL import Image
+        with telemetry.span("load_image") as span:
+            image = image_path if isinstance(image_path, Image.Image) else Image.open(image_path)
+            image.load()
+            span.set(pixels=image.width * image.height)
         
         analysis_prompt = f"""
         You are an expert math tutor analyzing a student's work on a whiteboard/paper.
@@ -71,9 +139,13 @@ def analyze_drawing(image_path, context="", model=None):
         Be encouraging and specific in your feedback.
         """
         
-        response = model.generate_content([analysis_prompt, image])
+        with telemetry.span("generate", task="analyze_drawing", model=model_label(model)) as span:
+            span.set(prompt_bytes=len(analysis_prompt.encode("utf-8")))
+            response = generate(model, [analysis_prompt, image], task="analyze_drawing", text=context, images=1)
         return response.text.strip()
         
+    except CallRejected:
+        return DEGRADED_REPLY
     except Exception as e:
         return f"Error analyzing drawing: {str(e)}"
 
@@ -94,7 +166,16 @@ def generate_practice_problem(subject, topic, difficulty, model=None):
         Make it engaging and practical.
         """
         
-        response = model.generate_content(problem_prompt)
+        with telemetry.span("generate", task="practice_problem", model=model_label(model)) as span:
+            span.set(prompt_bytes=len(problem_prompt.encode("utf-8")))
+            response = generate(
+                model,
+                problem_prompt,
+                task="practice_problem",
+                text=f"{subject} {topic} {difficulty}",
+            )
         return response.text.strip()
+    except CallRejected:
+        return DEGRADED_REPLY
     except Exception as e:
         return f"Error generating problem: {str(e)}" 
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Near-duplicate answer cache for tutor questions.
+
+Questions are turned into hashed word and character n-gram vectors and
+compared by cosine similarity against earlier questions asked in the same
+scope (subject, topic, difficulty, language). A close enough match returns
+the stored answer without a model call. Numbers, variables and operators
+must match exactly, so "3x+5=20" never reuses the answer for "3x+5=21".
+
+    GENIE_ANSWER_CACHE=0                disable the cache
+    GENIE_ANSWER_CACHE_THRESHOLD=0.88   minimum cosine similarity for a hit
+    GENIE_ANSWER_CACHE_TTL=3600         seconds an answer stays valid
+    GENIE_ANSWER_CACHE_SIZE=1000        entries kept before LRU eviction
+"""
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+import telemetry
+
+DIM = 1024
+
+# Words that change how a question is phrased but not what it asks
+STOPWORDS = {
+    "a", "an", "the", "what", "whats", "is", "are", "was", "were", "be", "explain", "describe",
+    "define", "definition", "meaning", "mean", "means", "tell", "me", "about", "please", "can",
+    "could", "would", "you", "your", "i", "my", "we", "do", "does", "did", "to", "of", "in", "on",
+    "for", "and", "or", "with", "give", "show", "help", "understand", "know", "want", "need",
+    "some", "quick", "simple", "simply", "briefly", "again", "it", "this", "that", "s",
+}
+
+# Replies whose meaning depends on the conversation so far
+CONVERSATIONAL = {
+    "yes", "yeah", "yep", "no", "nope", "ok", "okay", "sure", "thank", "thanks", "hi", "hello",
+    "hey", "right", "correct", "wrong", "maybe", "done", "next", "continue", "more",
+}
+
+WORD = re.compile(r"[a-z0-9]+")
+SIGNATURE = re.compile(r"\d+(?:\.\d+)?|[=+\-*/^<>]|\b[b-hj-z]\b")
+VARIABLE = re.compile(r"\b[b-hj-z]\b")
+
+
+def _stem(word):
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def content_words(text):
+    """Lowercased, stemmed words that carry the question's meaning"""
+    return [_stem(w) for w in WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+def signature(text):
+    """Numbers, single-letter variables and operators that must match exactly"""
+    text = text.lower().replace("'", "").replace("\u2019", "")
+    if not any(c.isdigit() for c in text):
+        # Without numbers, hyphens and slashes are punctuation, not operators
+        return tuple(VARIABLE.findall(text))
+    return tuple(SIGNATURE.findall(text))
+
+
+def _feature(name, weight, vector):
+    h = zlib.crc32(name.encode("utf-8"))
+    vector[h % DIM] += weight if h & 0x80000000 else -weight
+
+
+def vectorize(words):
+    """L2-normalized hashed vector of word unigrams, bigrams and char trigrams"""
+    vector = np.zeros(DIM, dtype=np.float32)
+    for word in words:
+        _feature("w:" + word, 1.0, vector)
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            _feature("c:" + padded[i:i + 3], 0.35, vector)
+    for left, right in zip(words, words[1:]):
+        _feature(f"b:{left} {right}", 0.5, vector)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class _Scope:
+    """Vectors for one scope, stacked into a matrix on demand"""
+
+    def __init__(self):
+        self.keys = []
+        self.vectors = []
+        self.matrix = None
+
+    def add(self, key, vector):
+        self.keys.append(key)
+        self.vectors.append(vector)
+        self.matrix = None
+
+    def remove(self, key):
+        index = self.keys.index(key)
+        del self.keys[index]
+        del self.vectors[index]
+        self.matrix = None
+
+    def scores(self, vector):
+        if self.matrix is None:
+            self.matrix = np.stack(self.vectors) if self.vectors else np.zeros((0, DIM), np.float32)
+        return self.matrix @ vector
+
+
+class AnswerCache:
+    """Scoped similarity cache with TTL and LRU eviction"""
+
+    def __init__(self, threshold=0.88, ttl=3600.0, max_entries=1000, clock=time.monotonic):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.scopes = {}
+        self.next_key = 0
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            threshold=float(os.getenv("GENIE_ANSWER_CACHE_THRESHOLD", "0.88")),
+            ttl=float(os.getenv("GENIE_ANSWER_CACHE_TTL", "3600")),
+            max_entries=int(os.getenv("GENIE_ANSWER_CACHE_SIZE", "1000")),
+        )
+
+    def _prepare(self, question):
+        words = content_words(question)
+        if all(word in CONVERSATIONAL or word.isdigit() for word in words):
+            # "yes", "ok" or a bare number answer the tutor's last question
+            return None
+        return vectorize(words), signature(question)
+
+    def _drop(self, key):
+        scope, _, _, _ = self.entries.pop(key)
+        self.scopes[scope].remove(key)
+        if not self.scopes[scope].keys:
+            del self.scopes[scope]
+
+    def get(self, scope, question):
+        """Cached answer for a near-duplicate question in the same scope, or None"""
+        prepared = self._prepare(question)
+        if prepared is None:
+            return None
+        vector, sig = prepared
+        now = self.clock()
+        with self.lock:
+            index = self.scopes.get(scope)
+            answer = None
+            if index is not None and index.keys:
+                scores = index.scores(vector)
+                for position in np.argsort(scores)[::-1]:
+                    if scores[position] < self.threshold:
+                        break
+                    key = index.keys[position]
+                    _, entry_sig, entry_answer, expires = self.entries[key]
+                    if expires <= now:
+                        continue
+                    if entry_sig == sig:
+                        self.entries.move_to_end(key)
+                        answer = entry_answer
+                        break
+            self.stats["hits" if answer is not None else "misses"] += 1
+        telemetry.count("genie_answer_cache_total", outcome="hit" if answer is not None else "miss")
+        return answer
+
+    def put(self, scope, question, answer):
+        """Store an answer; returns False for questions too short to reuse"""
+        prepared = self._prepare(question)
+        if prepared is None:
+            return False
+        vector, sig = prepared
+        now = self.clock()
+        with self.lock:
+            key = self.next_key
+            self.next_key += 1
+            self.entries[key] = (scope, sig, answer, now + self.ttl)
+            self.scopes.setdefault(scope, _Scope()).add(key, vector)
+            self.stats["stores"] += 1
+            # Expired entries sit at the LRU end unless they were hit recently
+            while self.entries:
+                oldest = next(iter(self.entries))
+                if len(self.entries) <= self.max_entries and self.entries[oldest][3] > now:
+                    break
+                self._drop(oldest)
+                self.stats["evictions"] += 1
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.scopes.clear()
+
+
+def cache_enabled():
+    return telemetry.env_flag("GENIE_ANSWER_CACHE", default=True)
+
+
+# Process-wide cache shared by every session
+answer_cache = AnswerCache.from_env()
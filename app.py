@@ -10,54 +10,36 @@ st.set_page_config(
 import os
 from dotenv import load_dotenv
 import numpy as np
-import google.generativeai as genai
-from google.cloud import speech_v1
-from google.cloud import texttospeech
 import tempfile
+import uuid
 from datetime import datetime
-from PIL import Image
-from streamlit_drawable_canvas import st_canvas
 
 # Import custom modules
-from audio_utils import AudioRecorder, transcribe_audio, text_to_speech
-from ai_utils import get_ai_response, analyze_drawing, generate_practice_problem
+from audio_utils import (
+    AudioRecorder, transcribe_audio, text_to_speech,
+    audio_backend, audio_backend_available, speech_clients,
+)
+from ai_utils import get_ai_response, analyze_drawing, generate_practice_problem, gemini_model, model_label
 from whiteboard import Whiteboard
+import telemetry
+import fast_math
+from session_store import backend_configured, store_from_env, MISSING
+from chat_view import CHAT_PAGE_SIZE, new_message, page_css, render_chat_html, without_html
+from warmup import lazy_module, warm_up
+import trace_capture
 
 # Load environment variables
 load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GOOGLE_CREDENTIALS_FILE = os.getenv("GOOGLE_CREDENTIALS_FILE")
-
-# Initialize clients
-speech_client = None
-tts_client = None
-model = None
-audio_available = False
-
-# Initialize clients silently
-try:
-    if GOOGLE_CREDENTIALS_FILE and os.path.exists(GOOGLE_CREDENTIALS_FILE):
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = GOOGLE_CREDENTIALS_FILE
-        speech_client = speech_v1.SpeechClient()
-        tts_client = texttospeech.TextToSpeechClient()
-except Exception:
-    pass
 
-# Gemini - Silent initialization
-try:
-    if GOOGLE_API_KEY:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-except Exception:
-    pass
-
-# Check if audio is available
-try:
-    import sounddevice as sd
-    sd.get_portaudio_version()
-    audio_available = True
-except Exception:
-    audio_available = False
+# The Google SDKs, PortAudio probe and canvas component load on first use.
+# Start loading them off the script thread so the first page renders without waiting.
+warm_up(
+    audio_backend,
+    gemini_model,
+    speech_clients,
+    lazy_module("streamlit_drawable_canvas"),
+    lazy_module("PIL.Image"),
+)
 
 # Constants
 LANGUAGES = {
@@ -80,18 +62,118 @@ SUBJECTS = {
 
 DIFFICULTY_LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
 
+# Session state that survives worker restarts when GENIE_SESSION_BACKEND is set.
+# The recorder, whiteboard and audio file are tied to one worker and are rebuilt.
+PERSISTED_KEYS = (
+    "conversation_history",
+    "current_subject",
+    "current_topic",
+    "difficulty_level",
+    "selected_language",
+    "current_problem",
+    "current_solution",
+    "last_solution_problem",
+    "last_response",
+)
+
+def tutoring_scope():
+    """Subject, topic and level that scope reuse of cached answers"""
+    return (st.session_state.current_subject, st.session_state.current_topic, st.session_state.difficulty_level)
+
 def generate_solution_response(problem, selected_language, model):
     if not problem:
         return "No problem available to generate a solution for."
     
     prompt = f"Provide a detailed, step-by-step solution for the following problem, appropriate for a student learning {st.session_state.current_subject} at a {st.session_state.difficulty_level} level:\n\nProblem: {problem}"
+    # No cache_scope: the shared prompt template would make different problems look alike
     response = get_ai_response(prompt, selected_language, model)
     return response
 
+def get_recorder():
+    """This session's audio recorder, created on first use"""
+    if "recorder" not in st.session_state:
+        st.session_state.recorder = AudioRecorder()
+    return st.session_state.recorder
+
+def add_message(role, content):
+    """Append a message to the conversation and jump back to the newest page"""
+    st.session_state.conversation_history.append(new_message(role, content))
+    st.session_state.chat_page = 0
+
+def trace_session_id():
+    """Random ID grouping this browser session's traced interactions.
+
+    Never the sid: traces are shared for replay, and the sid is the session's credential.
+    """
+    if "trace_session" not in st.session_state:
+        st.session_state.trace_session = uuid.uuid4().hex
+    return st.session_state.trace_session
+
+def trace_interaction(kind, **params):
+    """Record one interaction for offline replay when GENIE_TRACE_DIR is set"""
+    return trace_capture.interaction(
+        kind,
+        session=trace_session_id(),
+        model=model_label(gemini_model.get()),
+        language=st.session_state.selected_language,
+        cache_scope=list(tutoring_scope()),
+        **params,
+    )
+
+def render_debug_panel():
+    """Show recent per-stage timings collected by telemetry"""
+    with st.expander("⏱️ Performance (debug)"):
+        fast_path = fast_math.stats()
+        st.caption(f"Answered locally: {fast_path['handled']} • Sent to model: {fast_path['fell_through']}")
+        spans = telemetry.recent_spans(limit=25)
+        if not spans:
+            st.caption("No stages recorded yet.")
+            return
+        st.dataframe(
+            [{k: v for k, v in event.items() if k != "ts"} for event in spans],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+def get_session_store():
+    """Shared session store keyed by the ?sid= URL parameter, or None when sessions stay in-process
+
+    The sid is the session's only credential: anyone with the URL can load and overwrite it.
+    """
+    if "session_store" not in st.session_state:
+        store = None
+        if backend_configured():
+            session_id = st.query_params.get("sid")
+            if not session_id:
+                session_id = uuid.uuid4().hex
+                st.query_params["sid"] = session_id
+            store = store_from_env(session_id)
+        st.session_state.session_store = store
+    return st.session_state.session_store
+
+def persist_session_state():
+    """Write changed session keys through to the shared store"""
+    store = get_session_store()
+    if store is not None:
+        state = {key: st.session_state[key] for key in PERSISTED_KEYS if key in st.session_state}
+        if "conversation_history" in state:
+            state["conversation_history"] = without_html(state["conversation_history"])
+        store.sync(state, PERSISTED_KEYS)
+
+def rerun():
+    """Persist session state, then rerun the script"""
+    persist_session_state()
+    st.rerun()
+
 def initialize_session_state():
     """Initialize all session state variables"""
-    if "recorder" not in st.session_state and audio_available:
-        st.session_state.recorder = AudioRecorder()
+    store = get_session_store()
+    if store is not None:
+        for key in PERSISTED_KEYS:
+            if key not in st.session_state:
+                value = store.get(key)
+                if value is not MISSING:
+                    st.session_state[key] = value
     if "whiteboard" not in st.session_state:
         st.session_state.whiteboard = Whiteboard()
     if "is_recording" not in st.session_state:
@@ -122,6 +204,8 @@ def initialize_session_state():
         st.session_state.clear_canvas_counter = 0
     if "current_solution" not in st.session_state:
         st.session_state.current_solution = ""
+    if "chat_page" not in st.session_state:
+        st.session_state.chat_page = 0
 
 def main():
     initialize_session_state()
@@ -171,36 +255,14 @@ def main():
         # Voice Assistant Section
         st.markdown("### 🎤 Voice Assistant")
         
+        # Usually already probed by the warm-up thread while the settings above rendered
+        audio_available = audio_backend_available()
+        # Every page style in one block; elements a rerun skips are removed, so it is sent each run
+        st.markdown(page_css(audio_available), unsafe_allow_html=True)
+        
         if not audio_available:
             st.warning("🎤 Voice features are not available in this environment. Please use text input instead.")
         else:
-            # Google Assistant-like button styling
-            button_style = """
-                <style>
-                div.stButton > button {
-                    border-radius: 50%;
-                    height: 80px;
-                    width: 80px;
-                    font-size: 24px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    margin: 0 auto;
-                    background-color: #4285F4;
-                    color: white;
-                    border: none;
-                }
-                div.stButton > button:hover {
-                    background-color: #3367D6;
-                    border: none;
-                }
-                div.stButton > button:active {
-                    background-color: #ea4335;
-                }
-                </style>
-            """
-            st.markdown(button_style, unsafe_allow_html=True)
-            
             col1, col2, col3 = st.columns([1, 1, 1])
             with col2:
                 button_label = "🎤" if not st.session_state.is_recording else "⏹️"
@@ -209,8 +271,8 @@ def main():
                         try:
                             # Start recording
                             st.session_state.is_recording = True
-                            st.session_state.recorder.start_recording()
-                            st.rerun()
+                            get_recorder().start_recording()
+                            rerun()
                         except Exception as e:
                             st.error("Failed to start recording. Please try using text input instead.")
                             st.session_state.is_recording = False
@@ -218,47 +280,45 @@ def main():
                         try:
                             # Stop recording and process
                             st.session_state.is_recording = False
-                            audio_data = st.session_state.recorder.stop_recording()
+                            audio_data = get_recorder().stop_recording()
                             
                             if audio_data:
                                 # Get language settings
                                 lang_code = LANGUAGES[st.session_state.selected_language]["code"]
                                 voice_name = LANGUAGES[st.session_state.selected_language]["voice"]
                                 
-                                # Convert speech to text
-                                text = transcribe_audio(audio_data, lang_code, speech_client)
+                                with trace_interaction("voice", lang_code=lang_code, voice=voice_name) as trace:
+                                    trace.blob_file("audio", audio_data)
                                 
-                                if text and text != "No speech detected":
-                                    # Add to conversation history
-                                    st.session_state.conversation_history.append({
-                                        "role": "student",
-                                        "content": text,
-                                        "timestamp": datetime.now()
-                                    })
+                                    # Convert speech to text
+                                    speech_client, tts_client = speech_clients.get()
+                                    text = transcribe_audio(audio_data, lang_code, speech_client)
+                                    trace.input(text=text)
+                                
+                                    if text and text != "No speech detected":
+                                        # Add to conversation history
+                                        add_message("student", text)
                                     
-                                    # Get tutoring context
-                                    context = f"Subject: {st.session_state.current_subject}, Topic: {st.session_state.current_topic}, Level: {st.session_state.difficulty_level}"
-                                    if st.session_state.current_problem:
-                                        context += f"\nCurrent Problem: {st.session_state.current_problem[:200]}..."
+                                        # Get tutoring context
+                                        context = f"Subject: {st.session_state.current_subject}, Topic: {st.session_state.current_topic}, Level: {st.session_state.difficulty_level}"
+                                        if st.session_state.current_problem:
+                                            context += f"\nCurrent Problem: {st.session_state.current_problem[:200]}..."
                                     
-                                    # Get AI response
-                                    response = get_ai_response(text, st.session_state.selected_language, model)
-                                    st.session_state.last_response = response
+                                        # Get AI response
+                                        response = get_ai_response(text, st.session_state.selected_language, gemini_model.get(), cache_scope=tutoring_scope())
+                                        st.session_state.last_response = response
+                                        trace.output(reply=response)
                                     
-                                    # Add to conversation history
-                                    st.session_state.conversation_history.append({
-                                        "role": "tutor",
-                                        "content": response,
-                                        "timestamp": datetime.now()
-                                    })
+                                        # Add to conversation history
+                                        add_message("tutor", response)
                                     
-                                    # Generate speech
-                                    audio_file = text_to_speech(response, lang_code, voice_name, tts_client)
-                                    if audio_file:
-                                        st.session_state.audio_file = audio_file
+                                        # Generate speech
+                                        audio_file = text_to_speech(response, lang_code, voice_name, tts_client)
+                                        if audio_file:
+                                            st.session_state.audio_file = audio_file
                         except Exception as e:
                             st.error("Failed to process audio. Please try using text input instead.")
-                        st.rerun()
+                        rerun()
             
             # Status indicator
             status_text = "🔴 Listening..." if st.session_state.is_recording else "🎤 Tap to speak"
@@ -273,6 +333,10 @@ def main():
             st.markdown(f"<div style='background-color: #f0f2f6; padding: 10px; border-radius: 10px; margin: 10px 0; font-size: 14px;'>{st.session_state.last_response}</div>", unsafe_allow_html=True)
             if audio_available:
                 st.audio(st.session_state.audio_file, format="audio/mp3", autoplay=True)
+        
+        # Optional per-stage timing panel
+        if telemetry.ENABLED and telemetry.env_flag("GENIE_DEBUG_PANEL"):
+            render_debug_panel()
     
     # Main content area
     st.markdown("<h1 style='text-align: center; color: #1E88E5; margin-bottom: 10px;'>🧠 Genie AI - Omni Tutor</h1>", unsafe_allow_html=True)
@@ -284,22 +348,28 @@ def main():
     with tab1:
         st.markdown("### 💬 Tutoring Conversation")
         
-        # Display conversation history
-        chat_container = st.container()
-        with chat_container:
-            for i, message in enumerate(st.session_state.conversation_history[-15:]):  # Show last 15 messages
-                if message["role"] == "student":
-                    st.markdown(f"""
-                    <div style='background-color: #e3f2fd; padding: 15px; border-radius: 15px; margin: 10px 0; margin-left: 50px; border-left: 4px solid #2196f3;'>
-                        <strong>👤 You:</strong> {message['content']}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div style='background-color: #f8f9fa; padding: 15px; border-radius: 15px; margin: 10px 0; margin-right: 50px; border-left: 4px solid #4caf50;'>
-                        <strong>🧠 Tutor:</strong> {message['content']}
-                    </div>
-                    """, unsafe_allow_html=True)
+        # Display conversation history, newest page first
+        history = st.session_state.conversation_history
+        page_count = max(1, -(-len(history) // CHAT_PAGE_SIZE))
+        page = min(st.session_state.chat_page, page_count - 1)
+        if page_count > 1:
+            col_older, col_page, col_newer = st.columns([1, 2, 1])
+            with col_older:
+                if st.button("⬆️ Older", disabled=page >= page_count - 1, key="chat_older"):
+                    st.session_state.chat_page = page + 1
+                    rerun()
+            with col_page:
+                st.caption(f"Page {page_count - page} of {page_count}")
+            with col_newer:
+                if st.button("⬇️ Newer", disabled=page == 0, key="chat_newer"):
+                    st.session_state.chat_page = page - 1
+                    rerun()
+        with st.container():
+            with telemetry.span("render_chat") as span:
+                chat_html = render_chat_html(history, page)
+                span.set(messages=len(history), html_bytes=len(chat_html.encode("utf-8")))
+            if chat_html:
+                st.markdown(chat_html, unsafe_allow_html=True)
         
         # Text input for typing
         st.markdown("---")
@@ -311,11 +381,7 @@ def main():
         
         if send_button and user_input:
             # Add to conversation history
-            st.session_state.conversation_history.append({
-                "role": "student",
-                "content": user_input,
-                "timestamp": datetime.now()
-            })
+            add_message("student", user_input)
             
             # Get tutoring context
             context = f"Subject: {st.session_state.current_subject}, Topic: {st.session_state.current_topic}, Level: {st.session_state.difficulty_level}"
@@ -323,17 +389,15 @@ def main():
                 context += f"\nCurrent Problem: {st.session_state.current_problem[:200]}..."
             
             # Get AI response
-            with st.spinner("🤔 Thinking..."):
-                response = get_ai_response(user_input, st.session_state.selected_language, model)
+            with st.spinner("🤔 Thinking..."), trace_interaction("chat") as trace:
+                trace.input(text=user_input)
+                response = get_ai_response(user_input, st.session_state.selected_language, gemini_model.get(), cache_scope=tutoring_scope())
+                trace.output(reply=response)
             
             # Add to conversation history
-            st.session_state.conversation_history.append({
-                "role": "tutor",
-                "content": response,
-                "timestamp": datetime.now()
-            })
+            add_message("tutor", response)
             
-            st.rerun()
+            rerun()
     
     with tab2:
         # Header and Generate Problem button
@@ -341,27 +405,19 @@ def main():
         with col_title:
             st.markdown("### 📝 Interactive Whiteboard")
         with col_button:
-            # Add custom CSS for button alignment
-            st.markdown("""
-            <style>
-            div[data-testid="stColumn"] > div > div > button {
-                margin-top: 20px; /* Adjust this value to align with the title */
-                float: right; /* Pushes the button to the right within its column */
-            }
-            </style>
-            """, unsafe_allow_html=True)
-            
             if st.button("📝 Question", type="primary", use_container_width=False, key="generate_problem_button"): # Set use_container_width to False for better control
                 with st.spinner("Creating a personalized problem..."):
-                    problem = generate_practice_problem(
-                        st.session_state.current_subject,
-                        st.session_state.current_topic,
-                        st.session_state.difficulty_level,
-                        model
-                    )
+                    with trace_interaction("practice_problem") as trace:
+                        problem = generate_practice_problem(
+                            st.session_state.current_subject,
+                            st.session_state.current_topic,
+                            st.session_state.difficulty_level,
+                            gemini_model.get()
+                        )
+                        trace.output(reply=problem)
                     st.session_state.current_problem = problem
                     st.session_state.clear_canvas_counter += 1
-                    st.rerun()
+                    rerun()
 
         # Display current problem if exists
         if st.session_state.current_problem:
@@ -396,34 +452,19 @@ def main():
         with col4:
             if st.button("🗑️ Clear", type="secondary", use_container_width=True):
                 st.session_state.clear_canvas_counter += 1
-                st.rerun()
+                rerun()
 
         # Canvas container with better styling
         st.markdown("### ✏️ Draw Your Solution Below")
         
-        # Enhanced CSS for canvas visibility
-        st.markdown("""
-        <style>
-        .stCanvas > div {
-            border: 3px solid #4285F4 !important;
-            border-radius: 10px !important;
-            box-shadow: 0 4px 12px rgba(66, 133, 244, 0.3) !important;
-            background-color: white !important;
-            margin: 20px 0 !important;
-        }
-        .stCanvas canvas {
-            border-radius: 8px !important;
-            background-color: white !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
         # Create a container for the canvas
         canvas_container = st.container()
         
         with canvas_container:
             # Main canvas with improved settings
             try:
+                # Usually already imported by the warm-up thread
+                from streamlit_drawable_canvas import st_canvas
                 canvas_result = st_canvas(
                     fill_color="rgba(255, 255, 255, 0)",  # Transparent fill
                     stroke_width=stroke_width,
@@ -463,57 +504,56 @@ def main():
                     if st.button("🔍 Analyze", type="primary", use_container_width=True):
                         with st.spinner("🤔 Analyzing your solution..."):
                             try:
-                                # Convert canvas image data to PIL Image
-                                image = Image.fromarray(image_array.astype(np.uint8))
-                                
-                                # Save image temporarily
-                                with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
-                                    image.save(temp_file.name)
-                                    temp_file_path = temp_file.name
+                                language = LANGUAGES[st.session_state.selected_language]
+                                with trace_interaction("canvas", lang_code=language["code"], voice=language["voice"]) as trace:
+                                    # Save image temporarily
+                                    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
+                                        with telemetry.span("encode_canvas") as span:
+                                            # Convert canvas image data to PIL Image
+                                            from PIL import Image
+                                            image = Image.fromarray(image_array.astype(np.uint8))
+                                            image.save(temp_file.name)
+                                            span.set(png_bytes=os.path.getsize(temp_file.name))
+                                        temp_file_path = temp_file.name
+                                        trace.blob_file("image", temp_file_path)
                                     
-                                    # Get tutoring context
-                                    context = f"Subject: {st.session_state.current_subject}, Topic: {st.session_state.current_topic}, Level: {st.session_state.difficulty_level}"
-                                    if st.session_state.current_problem:
-                                        context += f"\nCurrent Problem: {st.session_state.current_problem}"
+                                        # Get tutoring context
+                                        context = f"Subject: {st.session_state.current_subject}, Topic: {st.session_state.current_topic}, Level: {st.session_state.difficulty_level}"
+                                        if st.session_state.current_problem:
+                                            context += f"\nCurrent Problem: {st.session_state.current_problem}"
                                     
-                                    # Analyze the drawing
-                                    result = analyze_drawing(temp_file_path, context, model)
+                                        # Analyze the drawing
+                                        trace.input(context=context)
+                                        result = analyze_drawing(temp_file_path, context, gemini_model.get())
+                                        trace.output(reply=result)
                                     
-                                    if result:
-                                        # Get language settings for voice
-                                        lang_code = LANGUAGES[st.session_state.selected_language]["code"]
-                                        voice_name = LANGUAGES[st.session_state.selected_language]["voice"]
+                                        if result:
+                                            # Get language settings for voice
+                                            lang_code = LANGUAGES[st.session_state.selected_language]["code"]
+                                            voice_name = LANGUAGES[st.session_state.selected_language]["voice"]
                                         
-                                        # Generate voice feedback
-                                        audio_file = text_to_speech(result, lang_code, voice_name, tts_client)
-                                        if audio_file:
-                                            st.session_state.audio_file = audio_file
+                                            # Generate voice feedback
+                                            audio_file = text_to_speech(result, lang_code, voice_name, speech_clients.get()[1])
+                                            if audio_file:
+                                                st.session_state.audio_file = audio_file
                                         
-                                        # Add to conversation history
-                                        st.session_state.conversation_history.append({
-                                            "role": "student",
-                                            "content": "I've drawn my solution on the whiteboard.",
-                                            "timestamp": datetime.now()
-                                        })
+                                            # Add to conversation history
+                                            add_message("student", "I've drawn my solution on the whiteboard.")
                                         
-                                        st.session_state.conversation_history.append({
-                                            "role": "tutor",
-                                            "content": f"📝 **Drawing Analysis:**\n\n{result}",
-                                            "timestamp": datetime.now()
-                                        })
+                                            add_message("tutor", f"📝 **Drawing Analysis:**\n\n{result}")
                                         
-                                        # Display analysis result
-                                        st.success("✅ Analysis Complete!")
-                                        st.markdown(f"""
-                                        <div style='background-color: #e8f5e8; padding: 20px; border-radius: 15px; border-left: 4px solid #4caf50; margin: 20px 0;'>
-                                            <strong>🧠 AI Tutor Feedback:</strong><br><br>
-                                            {result}
-                                        </div>
-                                        """, unsafe_allow_html=True)
+                                            # Display analysis result
+                                            st.success("✅ Analysis Complete!")
+                                            st.markdown(f"""
+                                            <div style='background-color: #e8f5e8; padding: 20px; border-radius: 15px; border-left: 4px solid #4caf50; margin: 20px 0;'>
+                                                <strong>🧠 AI Tutor Feedback:</strong><br><br>
+                                                {result}
+                                            </div>
+                                            """, unsafe_allow_html=True)
                                         
-                                        # Clean up temp file
-                                        if os.path.exists(temp_file_path):
-                                            os.unlink(temp_file_path)
+                                            # Clean up temp file
+                                            if os.path.exists(temp_file_path):
+                                                os.unlink(temp_file_path)
                             
                             except Exception as e:
                                 st.error(f"Error analyzing drawing: {str(e)}")
@@ -522,17 +562,16 @@ def main():
                     if st.button("💡 Solution", type="secondary", use_container_width=True):
                         with st.spinner("✍️ Generating solution..."):
                             try:
-                                solution = generate_solution_response(
-                                    st.session_state.current_problem,
-                                    st.session_state.selected_language,
-                                    model
-                                )
+                                with trace_interaction("solution") as trace:
+                                    trace.input(problem=st.session_state.current_problem)
+                                    solution = generate_solution_response(
+                                        st.session_state.current_problem,
+                                        st.session_state.selected_language,
+                                        gemini_model.get()
+                                    )
+                                    trace.output(reply=solution)
                                 if solution:
-                                    st.session_state.conversation_history.append({
-                                        "role": "tutor",
-                                        "content": f"Here's a step-by-step solution to the problem:\n\n{solution}",
-                                        "timestamp": datetime.now()
-                                    })
+                                    add_message("tutor", f"Here's a step-by-step solution to the problem:\n\n{solution}")
                                     st.session_state.current_solution = solution
                                 
                             except Exception as e:
@@ -617,6 +656,8 @@ def main():
             <p style='font-size: 16px;'>I'm here to guide you through every step of your learning journey!</p>
         </div>
         """, unsafe_allow_html=True)
+    
+    persist_session_state()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,40 @@
 import streamlit as st
-import sounddevice as sd
 import numpy as np
 import wave
 import tempfile
 import os
-from google.cloud import speech_v1
-from google.cloud import texttospeech
+import telemetry
+from warmup import LazyResource
+
+# sounddevice and the Google Cloud SDKs are imported on first use; see warmup.py
+
+def probe_audio_backend():
+    """True if sounddevice is installed and PortAudio loads"""
+    try:
+        import sounddevice as sd
+        sd.get_portaudio_version()
+        return True
+    except Exception:
+        return False
+
+def create_speech_clients(credentials_file):
+    """Speech-to-Text and Text-to-Speech clients, or (None, None) without credentials"""
+    if not credentials_file or not os.path.exists(credentials_file):
+        return None, None
+    try:
+        from google.cloud import speech_v1
+        from google.cloud import texttospeech
+        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_file
+        return speech_v1.SpeechClient(), texttospeech.TextToSpeechClient()
+    except Exception:
+        return None, None
+
+audio_backend = LazyResource("portaudio", probe_audio_backend)
+speech_clients = LazyResource("speech_clients", lambda: create_speech_clients(os.getenv("GOOGLE_CREDENTIALS_FILE")))
+
+def audio_backend_available():
+    """Whether voice recording works here, probed once per process"""
+    return audio_backend.get()
 
 class AudioRecorder:
     def __init__(self):
@@ -25,6 +54,7 @@ class AudioRecorder:
             if self.is_recording:
                 self.recording.append(indata.copy())
         
+        import sounddevice as sd
         self.stream = sd.InputStream(
             samplerate=self.sample_rate,
             channels=self.channels,
@@ -44,17 +74,19 @@ class AudioRecorder:
         if not self.recording:
             return None
             
-        # Combine all recorded chunks
-        audio_data = np.concatenate(self.recording, axis=0)
-        
-        # Save to temporary WAV file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-            with wave.open(temp_file.name, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)  # 2 bytes per sample
-                wf.setframerate(self.sample_rate)
-                wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
-            return temp_file.name
+        with telemetry.span("record") as span:
+            # Combine all recorded chunks
+            audio_data = np.concatenate(self.recording, axis=0)
+            span.set(audio_seconds=len(audio_data) / self.sample_rate, wav_bytes=audio_data.size * 2)
+            
+            # Save to temporary WAV file
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
+                with wave.open(temp_file.name, 'wb') as wf:
+                    wf.setnchannels(self.channels)
+                    wf.setsampwidth(2)  # 2 bytes per sample
+                    wf.setframerate(self.sample_rate)
+                    wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
+                return temp_file.name
 
 def transcribe_audio(audio_file, language_code="en-US", speech_client=None):
     """Convert speech to text using Google Speech-to-Text"""
@@ -62,6 +94,7 @@ def transcribe_audio(audio_file, language_code="en-US", speech_client=None):
         return "Speech-to-Text service not available. Please check your credentials."
     
     try:
+        from google.cloud import speech_v1
         with open(audio_file, 'rb') as audio:
             content = audio.read()
         
@@ -72,7 +105,9 @@ def transcribe_audio(audio_file, language_code="en-US", speech_client=None):
             language_code=language_code,
         )
         
-        response = speech_client.recognize(config=config, audio=audio)
+        with telemetry.span("transcribe", language=language_code) as span:
+            span.set(request_bytes=len(content))
+            response = speech_client.recognize(config=config, audio=audio)
         
         if not response.results:
             return "No speech detected"
@@ -98,6 +133,7 @@ def text_to_speech(text, language_code="en-US", voice_name="en-US-Studio-O", tts
         return None
     
     try:
+        from google.cloud import texttospeech
         synthesis_input = texttospeech.SynthesisInput(text=text)
         
         voice = texttospeech.VoiceSelectionParams(
@@ -109,11 +145,13 @@ def text_to_speech(text, language_code="en-US", voice_name="en-US-Studio-O", tts
             audio_encoding=texttospeech.AudioEncoding.MP3
         )
         
-        response = tts_client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
+        with telemetry.span("tts", language=language_code, voice=voice_name) as span:
+            response = tts_client.synthesize_speech(
+                input=synthesis_input,
+                voice=voice,
+                audio_config=audio_config
+            )
+            span.set(request_bytes=len(text.encode("utf-8")), response_bytes=len(response.audio_content))
         
         # Save to temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
@@ -0,0 +1,217 @@
+"""Grade a directory or manifest of whiteboard images from the command line.
+
+Each image goes through the same ai_utils.analyze_drawing call as the
+Analyze button in the app. Images are preprocessed in a process pool, model
+calls run with bounded concurrency, and every result is appended to a JSONL
+checkpoint so an interrupted run can be resumed.
+
+    python batch_grade.py boards/ --subject Mathematics --topic Algebra -o feedback.jsonl
+    python batch_grade.py manifest.csv -o feedback.jsonl --concurrency 4
+
+A manifest is a CSV or JSONL file with an `image` column (relative to the
+manifest) and optional `id`, `subject`, `topic`, `level`, `problem` and
+`context` columns.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from dotenv import load_dotenv
+from PIL import Image
+
+from ai_utils import analyze_drawing, create_model, DEGRADED_REPLY
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif", ".tif", ".tiff"}
+
+# Replies analyze_drawing returns instead of raising
+FAILURE_PREFIXES = ("Error analyzing drawing:", "AI model not available", DEGRADED_REPLY)
+
+
+def build_context(subject=None, topic=None, level=None, problem=None):
+    """Tutoring context in the same shape the app sends"""
+    context = f"Subject: {subject or 'Mathematics'}, Topic: {topic or 'General'}, Level: {level or 'Intermediate'}"
+    if problem:
+        context += f"\nCurrent Problem: {problem}"
+    return context
+
+
+def load_items(source, defaults):
+    """List of {id, image, context} dicts from a directory or manifest"""
+    items = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                items.append({"id": name, "image": os.path.join(source, name), "context": build_context(**defaults)})
+        return items
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, newline="") as f:
+        if source.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    for row in rows:
+        image = row["image"]
+        if not os.path.isabs(image):
+            image = os.path.join(base, image)
+        context = row.get("context") or build_context(
+            row.get("subject") or defaults.get("subject"),
+            row.get("topic") or defaults.get("topic"),
+            row.get("level") or defaults.get("level"),
+            row.get("problem") or defaults.get("problem"),
+        )
+        items.append({"id": row.get("id") or row["image"], "image": image, "context": context})
+    return items
+
+
+def completed_ids(output_path):
+    """IDs already graded successfully in an existing checkpoint"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+
+def preprocess(path, max_side=1600):
+    """Flatten onto white, downscale and re-encode as PNG bytes (runs in a worker process)"""
+    with Image.open(path) as image:
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image).convert("RGB")
+        image.thumbnail((max_side, max_side))
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def grade(item, png_bytes, model):
+    start = time.perf_counter()
+    feedback = analyze_drawing(io.BytesIO(png_bytes), item["context"], model)
+    elapsed = time.perf_counter() - start
+    status = "error" if feedback.startswith(FAILURE_PREFIXES) else "ok"
+    return {
+        "id": item["id"],
+        "image": item["image"],
+        "status": status,
+        "feedback": feedback,
+        "latency_ms": round(elapsed * 1000, 1),
+        "graded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run(items, output_path, model, workers, concurrency, max_side):
+    """Grade items, appending each result to output_path; returns summary stats"""
+    lock = threading.Lock()
+    latencies = []
+    counts = {"ok": 0, "error": 0}
+    # Keep preprocessed images from piling up ahead of the model calls
+    window = threading.BoundedSemaphore(concurrency * 4)
+
+    def write(record):
+        with lock:
+            with open(output_path, "a") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            counts[record["status"]] += 1
+            latencies.append(record["latency_ms"])
+            done = counts["ok"] + counts["error"]
+        print(f"[{done}/{len(items)}] {record['status']:<5} {record['id']} ({record['latency_ms']:.0f} ms)",
+              file=sys.stderr)
+
+    def grade_and_write(item, png_bytes):
+        try:
+            write(grade(item, png_bytes, model))
+        finally:
+            window.release()
+
+    grading = []
+
+    def on_preprocessed(item, future):
+        try:
+            png_bytes = future.result()
+        except Exception as e:
+            window.release()
+            write({"id": item["id"], "image": item["image"], "status": "error",
+                   "feedback": f"Could not read image: {e}", "latency_ms": 0.0})
+            return
+        grading.append(threads.submit(grade_and_write, item, png_bytes))
+
+    start = time.perf_counter()
+    # The process pool shuts down first, so every preprocessing callback
+    # has queued its grading job before the thread pool stops accepting work
+    with ThreadPoolExecutor(max_workers=concurrency) as threads, \
+            ProcessPoolExecutor(max_workers=workers) as processes:
+        for item in items:
+            window.acquire()
+            future = processes.submit(preprocess, item["image"], max_side)
+            future.add_done_callback(lambda f, item=item: on_preprocessed(item, f))
+    for future in grading:
+        future.result()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "graded": counts["ok"],
+        "failed": counts["error"],
+        "seconds": elapsed,
+        "images_per_minute": (len(items) / elapsed * 60) if elapsed else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] if latencies else None,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="Directory of images or a CSV/JSONL manifest")
+    parser.add_argument("-o", "--output", default="feedback.jsonl", help="JSONL checkpoint/results file")
+    parser.add_argument("--subject")
+    parser.add_argument("--topic")
+    parser.add_argument("--level")
+    parser.add_argument("--problem", help="Problem statement shared by every board")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Preprocessing processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent model calls")
+    parser.add_argument("--max-side", type=int, default=1600, help="Downscale images to this many pixels")
+    parser.add_argument("--no-resume", action="store_true", help="Regrade images already in the output file")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    model = create_model(os.getenv("GOOGLE_API_KEY"))
+    if model is None:
+        parser.error("AI model not available. Please check your GOOGLE_API_KEY.")
+
+    defaults = {"subject": args.subject, "topic": args.topic, "level": args.level, "problem": args.problem}
+    items = load_items(args.source, defaults)
+    if not args.no_resume:
+        done = completed_ids(args.output)
+        skipped = len(items)
+        items = [item for item in items if item["id"] not in done]
+        skipped -= len(items)
+        if skipped:
+            print(f"Resuming: skipping {skipped} already graded image(s)", file=sys.stderr)
+    if not items:
+        print("Nothing to grade.", file=sys.stderr)
+        return 0
+
+    stats = run(items, args.output, model, args.workers, args.concurrency, args.max_side)
+    print(
+        f"Graded {stats['graded']} image(s), {stats['failed']} failed in {stats['seconds']:.1f}s "
+        f"({stats['images_per_minute']:.1f} images/min, p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms)"
+    )
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
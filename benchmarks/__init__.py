@@ -0,0 +1 @@
+"""Performance benchmarks that run against local stand-ins for Google services."""
@@ -0,0 +1,214 @@
+import io
+import json
+import math
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+WORDS = (
+    "great question let us work through this step by step first notice that "
+    "the equation can be simplified by isolating the variable on one side "
+    "remember to apply the same operation to both sides what do you get"
+).split()
+
+
+class LatencyModel:
+    """Lognormal latency distribution with a fixed seed"""
+
+    def __init__(self, median=0.3, sigma=0.35, scale=1.0, seed=0):
+        self.median = median
+        self.sigma = sigma
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample(self):
+        with self.lock:
+            z = self.rng.gauss(0, 1)
+        return self.median * math.exp(self.sigma * z) * self.scale
+
+    def wait(self):
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class SizeModel:
+    """Lognormal payload size distribution, clamped to [minimum, maximum]"""
+
+    def __init__(self, median=600, sigma=0.5, minimum=1, maximum=20000, seed=0):
+        self.median = median
+        self.sigma = sigma
+        self.minimum = minimum
+        self.maximum = maximum
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample(self):
+        with self.lock:
+            z = self.rng.gauss(0, 1)
+        return int(min(self.maximum, max(self.minimum, self.median * math.exp(self.sigma * z))))
+
+
+class WireCounter:
+    """Bytes sent to and received from a fake backend"""
+
+    def __init__(self):
+        self.calls = 0
+        self.sent = 0
+        self.received = 0
+        self.lock = threading.Lock()
+
+    def record(self, sent, received):
+        with self.lock:
+            self.calls += 1
+            self.sent += sent
+            self.received += received
+
+    def snapshot(self):
+        with self.lock:
+            return {"calls": self.calls, "bytes_sent": self.sent, "bytes_received": self.received}
+
+
+def payload_size(contents):
+    """Approximate number of bytes a request body carries for the given contents"""
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return len(contents.encode("utf-8"))
+    if isinstance(contents, (bytes, bytearray)):
+        return len(contents)
+    if isinstance(contents, (list, tuple)):
+        return sum(payload_size(part) for part in contents)
+    if hasattr(contents, "save") and hasattr(contents, "mode"):
+        buffer = io.BytesIO()
+        contents.save(buffer, format="PNG")
+        return buffer.tell()
+    inline = getattr(contents, "inline_data", None)
+    data = getattr(inline if inline is not None else contents, "data", None)
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    return len(str(contents).encode("utf-8"))
+
+
+def fake_text(rng, size):
+    """Deterministic filler text of roughly `size` characters"""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+class FakeGenerativeModel:
+    """Stand-in for google.generativeai.GenerativeModel"""
+
+    def __init__(self, model_name="gemini-1.5-flash", latency=None, reply_size=None, seed=0):
+        self.model_name = model_name
+        self.latency = latency or LatencyModel(median=0.6, seed=seed)
+        self.reply_size = reply_size or SizeModel(median=700, seed=seed)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.wire = WireCounter()
+
+    def generate_content(self, contents, generation_config=None, **kwargs):
+        sent = payload_size(contents)
+        self.latency.wait()
+        with self.lock:
+            text = fake_text(self.rng, self.reply_size.sample())
+        self.wire.record(sent, len(text.encode("utf-8")))
+        return SimpleNamespace(text=text)
+
+
+class _FakeModels:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def generate_content(self, model=None, contents=None, config=None):
+        return self.owner.generate(model, contents, config)
+
+
+class FakeGenaiClient:
+    """Stand-in for google.genai.Client as used by ScreenAnalyzer"""
+
+    def __init__(self, latency=None, reply_size=None, seed=0):
+        self.latency = latency or LatencyModel(median=0.4, seed=seed)
+        self.reply_size = reply_size or SizeModel(median=8, sigma=0.3, seed=seed)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.wire = WireCounter()
+        self.models = _FakeModels(self)
+
+    def generate(self, model, contents, config=None):
+        sent = payload_size(contents)
+        self.latency.wait()
+        with self.lock:
+            if getattr(config, "response_mime_type", None) == "application/json":
+                # Packed batch request: one result per "Image N:" label
+                images = sum(1 for part in contents if isinstance(part, str) and part.startswith("Image "))
+                text = json.dumps([self._result() for _ in range(images)])
+            else:
+                text = self._result()
+        self.wire.record(sent, len(text))
+        return SimpleNamespace(text=text)
+
+    def _result(self):
+        return str(self.rng.randint(0, 10 ** max(1, self.reply_size.sample())))
+
+
+class FakeSpeechClient:
+    """Stand-in for google.cloud.speech_v1.SpeechClient"""
+
+    def __init__(self, latency=None, transcript_size=None, seed=0):
+        self.latency = latency or LatencyModel(median=0.8, seed=seed)
+        self.transcript_size = transcript_size or SizeModel(median=60, seed=seed)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.wire = WireCounter()
+
+    def recognize(self, config=None, audio=None):
+        sent = len(getattr(audio, "content", b"") or b"")
+        self.latency.wait()
+        with self.lock:
+            transcript = fake_text(self.rng, self.transcript_size.sample())
+        self.wire.record(sent, len(transcript.encode("utf-8")))
+        alternative = SimpleNamespace(transcript=transcript)
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative])])
+
+
+class FakeTextToSpeechClient:
+    """Stand-in for google.cloud.texttospeech.TextToSpeechClient.
+
+    Audio size scales with the input text, roughly like 32 kbps MP3 speech.
+    """
+
+    BYTES_PER_CHAR = 270
+
+    def __init__(self, latency=None, seed=0):
+        self.latency = latency or LatencyModel(median=0.5, seed=seed)
+        self.wire = WireCounter()
+
+    def synthesize_speech(self, input=None, voice=None, audio_config=None):
+        text = getattr(input, "text", "") or ""
+        sent = len(text.encode("utf-8"))
+        self.latency.wait()
+        audio = b"\xff\xfb" * (len(text) * self.BYTES_PER_CHAR // 2)
+        self.wire.record(sent, len(audio))
+        return SimpleNamespace(audio_content=audio)
+
+
+class NullInputStream:
+    """Stand-in for sounddevice.InputStream once recording has finished"""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,138 @@
+"""Cold-start benchmark: time to import app.py and to render its first page.
+
+Each sample runs in a fresh interpreter so nothing is cached in-process.
+Reports wall time, the slowest imports made directly by the module (from
+`python -X importtime`), and which heavy SDKs were already loaded when the
+import returned (ideally none: they load on first use or in the warm-up
+thread).
+
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --first-run --warmup
+
+The background warm-up is disabled by default so the import measures only
+the script thread; --warmup keeps it on, as in production.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.report import summarize, print_table, write_json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use or by warmup.warm_up(), never by importing app.py
+HEAVY_MODULES = (
+    "google.generativeai",
+    "google.genai",
+    "google.cloud.speech_v1",
+    "google.cloud.texttospeech",
+    "sounddevice",
+    "streamlit_drawable_canvas",
+    "PIL.Image",
+)
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter() - start
+first_run = None
+if {first_run}:
+    from streamlit.testing.v1 import AppTest
+    start = time.perf_counter()
+    AppTest.from_file({module}.__file__, default_timeout=120).run()
+    first_run = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print("BENCH" + json.dumps({{"import_s": imported, "first_run_s": first_run, "heavy_loaded": heavy}}))
+"""
+
+
+def parse_importtime(stderr, module):
+    """Cumulative microseconds of each import made directly by `module`, from -X importtime output"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        name = name[1:].rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        entries.append((level, name.strip(), int(cumulative)))
+
+    # A module's line comes after its imports', so its direct children are the
+    # entries one level deeper since the previous entry at its own level or above
+    children = {}
+    for index, (level, name, _) in enumerate(entries):
+        if name != module:
+            continue
+        for child_level, child, cumulative in reversed(entries[:index]):
+            if child_level <= level:
+                break
+            if child_level == level + 1:
+                children[child] = children.get(child, 0) + cumulative
+    return children
+
+
+def sample(module="app", first_run=False, warmup=False):
+    """One cold import (and optionally one headless first render) in a fresh interpreter"""
+    env = dict(os.environ, GENIE_WARMUP="1" if warmup else "0")
+    code = CHILD.format(module=module, first_run=first_run, heavy=HEAVY_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("BENCH")]
+    if proc.returncode or not lines:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors[-20:]))
+    result = json.loads(lines[-1][len("BENCH"):])
+    result["imports_us"] = parse_importtime(proc.stderr, module)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--first-run", action="store_true",
+                        help="Also time the first headless render with streamlit.testing")
+    parser.add_argument("--warmup", action="store_true", help="Keep the background warm-up thread on")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args(argv)
+
+    samples = [sample(args.module, args.first_run, args.warmup) for _ in range(args.runs)]
+
+    latency = {"import": summarize([s["import_s"] for s in samples])}
+    if args.first_run:
+        latency["first_run"] = summarize([s["first_run_s"] for s in samples])
+    print_table(f"cold start of {args.module} ({args.runs} runs, warm-up {'on' if args.warmup else 'off'})", latency)
+
+    imports = {}
+    for s in samples:
+        for package, us in s["imports_us"].items():
+            imports.setdefault(package, []).append(us)
+    slowest = sorted(imports.items(), key=lambda item: -sum(item[1]) / len(item[1]))[:args.top]
+    print(f"  slowest imports made by {args.module} (mean, cumulative):")
+    for package, values in slowest:
+        print(f"    {package:<32}{sum(values) / len(values) / 1000:>10.1f} ms")
+
+    heavy = sorted({name for s in samples for name in s["heavy_loaded"]})
+    print(f"  heavy modules loaded at import: {', '.join(heavy) if heavy else 'none'}")
+
+    report = {
+        "config": vars(args),
+        "latency": latency,
+        "imports_ms": {package: sum(values) / len(values) / 1000 for package, values in slowest},
+        "heavy_loaded": heavy,
+    }
+    if args.json:
+        write_json(args.json, report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
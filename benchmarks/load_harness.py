@@ -0,0 +1,251 @@
+"""Concurrent-session load harness for app.py reruns.
+
+Simulates N Streamlit sessions with Streamlit's headless AppTest API, each
+performing a weighted mix of chat, canvas strokes, drawing analysis,
+practice questions and plain reruns (tab switches render every tab, so a
+switch is a rerun with no widget change). AI clients are stubbed with the
+fakes from benchmarks.fakes; voice is left out because AppTest cannot drive
+the microphone.
+
+    python -m benchmarks.load_harness --sessions 20 --actions 30 --think-time 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import (
+    LatencyModel,
+    FakeGenerativeModel,
+    FakeSpeechClient,
+    FakeTextToSpeechClient,
+)
+from benchmarks.pipeline import disable_rate_limit, synthetic_canvas
+from benchmarks.report import summarize, print_table, write_json
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Session-state key the stub canvas reads its image from
+CANVAS_STATE_KEY = "_loadtest_canvas"
+
+DEFAULT_MIX = {"chat": 35, "stroke": 30, "analyze": 10, "question": 5, "tab": 20}
+
+QUESTIONS = [
+    "How do I solve 3x + 5 = 20?",
+    "Can you explain what a derivative is?",
+    "Why does the quadratic formula work?",
+    "I think the answer is 7, is that right?",
+    "What is the difference between mean and median?",
+]
+
+
+def install_stubs(latency_scale=0.0, seed=0):
+    """Point app.py's client constructors and canvas at local stand-ins"""
+    import google.generativeai as genai
+    import streamlit as st
+    import streamlit_drawable_canvas
+    from google.cloud import speech_v1, texttospeech
+
+    model = FakeGenerativeModel(latency=LatencyModel(median=0.6, scale=latency_scale, seed=seed), seed=seed)
+    speech = FakeSpeechClient(latency=LatencyModel(median=0.8, scale=latency_scale, seed=seed + 1), seed=seed)
+    tts = FakeTextToSpeechClient(latency=LatencyModel(median=0.5, scale=latency_scale, seed=seed + 2), seed=seed)
+
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = lambda *args, **kwargs: model
+    speech_v1.SpeechClient = lambda *args, **kwargs: speech
+    texttospeech.TextToSpeechClient = lambda *args, **kwargs: tts
+
+    def fake_canvas(**kwargs):
+        return SimpleNamespace(image_data=st.session_state.get(CANVAS_STATE_KEY), json_data=None)
+
+    streamlit_drawable_canvas.st_canvas = fake_canvas
+
+    credentials = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    credentials.close()
+    os.environ["GOOGLE_API_KEY"] = "load-test"
+    os.environ["GOOGLE_CREDENTIALS_FILE"] = credentials.name
+    disable_rate_limit(concurrency=64)
+    return model
+
+
+def _button(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button
+    return None
+
+
+class Session:
+    """One simulated student driving an AppTest instance"""
+
+    def __init__(self, index, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.rng = random.Random(seed + index)
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.strokes = 0
+        self.samples = {}
+
+    def timed(self, action, fn):
+        wall = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - wall
+        self.samples.setdefault(action, []).append(elapsed)
+        return elapsed
+
+    def start(self):
+        self.timed("initial", self.at.run)
+
+    def chat(self):
+        self.at.text_area[0].input(self.rng.choice(QUESTIONS))
+        _button(self.at, "Send 📤").click()
+        self.at.run()
+
+    def stroke(self):
+        self.strokes += 1
+        canvas = synthetic_canvas(strokes=min(40, self.strokes), seed=self.index)
+        self.at.session_state[CANVAS_STATE_KEY] = canvas
+        self.at.run()
+
+    def analyze(self):
+        button = _button(self.at, "🔍 Analyze")
+        if button is None:
+            self.stroke()
+            button = _button(self.at, "🔍 Analyze")
+        button.click()
+        self.at.run()
+
+    def question(self):
+        _button(self.at, "📝 Question").click()
+        self.at.run()
+
+    def tab(self):
+        self.at.run()
+
+    def act(self, mix):
+        actions, weights = zip(*mix.items())
+        action = self.rng.choices(actions, weights=weights)[0]
+        return action, self.timed(action, getattr(self, action))
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown action '{name}'")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def run(sessions, actions, workers, mix, think_time, timeout, seed, trace_memory):
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = _rss_bytes()
+    traced_before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+
+    pool = [Session(i, seed, timeout) for i in range(sessions)]
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    lock = threading.Lock()
+    reruns = [0]
+
+    def drive(session):
+        session.start()
+        for _ in range(actions):
+            session.act(mix)
+        with lock:
+            reruns[0] += 1 + actions
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(drive, pool))
+
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    rss_after = _rss_bytes()
+    traced_after = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    if trace_memory:
+        tracemalloc.stop()
+
+    by_action = {}
+    for session in pool:
+        for action, samples in session.samples.items():
+            by_action.setdefault(action, []).extend(samples)
+    all_samples = [s for samples in by_action.values() for s in samples]
+
+    cpu_per_rerun = cpu / reruns[0]
+    report = {
+        "latency": {action: summarize(samples) for action, samples in sorted(by_action.items())},
+        "overall": summarize(all_samples),
+        "reruns": reruns[0],
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "cpu_ms_per_rerun": cpu_per_rerun * 1000,
+        # One core sustains think_time / cpu_per_rerun sessions that each rerun once per think_time
+        "sessions_per_core": think_time / cpu_per_rerun if cpu_per_rerun else None,
+    }
+    if rss_before is not None and rss_after is not None:
+        report["rss_bytes_per_session"] = (rss_after - rss_before) / sessions
+    if trace_memory:
+        report["traced_bytes_per_session"] = (traced_after - traced_before) / sessions
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="Number of simulated sessions")
+    parser.add_argument("--actions", type=int, default=20, help="Actions per session after the first load")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Threads driving sessions concurrently (1 gives the cleanest CPU numbers)")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="Action weights, e.g. chat=3,stroke=3,analyze=1,question=1,tab=2")
+    parser.add_argument("--think-time", type=float, default=5.0,
+                        help="Seconds between a real student's interactions, used for sessions-per-core")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="Scale fake backend latency (0 isolates rerun CPU)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-rerun AppTest timeout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="Also measure Python heap per session")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args(argv)
+
+    install_stubs(latency_scale=args.latency_scale, seed=args.seed)
+    report = run(args.sessions, args.actions, args.workers, args.mix, args.think_time,
+                 args.timeout, args.seed, args.trace_memory)
+    report["config"] = {k: v for k, v in vars(args).items() if k != "mix"}
+    report["config"]["mix"] = args.mix
+
+    print_table(f"rerun latency ({args.sessions} sessions x {args.actions} actions)",
+                dict(report["latency"], all=report["overall"]))
+    print(f"\n  reruns={report['reruns']} cpu={report['cpu_seconds']:.2f}s "
+          f"cpu/rerun={report['cpu_ms_per_rerun']:.1f} ms")
+    print(f"  sessions/core at {args.think_time:g}s think time: {report['sessions_per_core']:.1f}")
+    if "rss_bytes_per_session" in report:
+        print(f"  RSS per session: {report['rss_bytes_per_session'] / 1024:,.0f} KiB")
+    if "traced_bytes_per_session" in report:
+        print(f"  Python heap per session: {report['traced_bytes_per_session'] / 1024:,.0f} KiB")
+
+    if args.json:
+        write_json(args.json, report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
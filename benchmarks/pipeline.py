@@ -0,0 +1,263 @@
+"""End-to-end pipeline benchmark against local stand-ins for Google services.
+
+Drives the real functions in ai_utils, audio_utils, whiteboard and
+screen_analyzer with fake backends and reports per-stage latency
+percentiles, allocations and bytes on the wire. Each scenario runs once
+untimed first, so lazy SDK imports stay out of the percentiles.
+
+    python -m benchmarks.pipeline --iterations 50 --concurrency 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resilience
+from ai_utils import get_ai_response, analyze_drawing
+from audio_utils import AudioRecorder, transcribe_audio, text_to_speech
+from resilience import ResilientCaller, TokenBucket
+from screen_analyzer import ScreenAnalyzer
+from whiteboard import Whiteboard
+
+from benchmarks.fakes import (
+    LatencyModel,
+    FakeGenerativeModel,
+    FakeGenaiClient,
+    FakeSpeechClient,
+    FakeTextToSpeechClient,
+    NullInputStream,
+)
+from benchmarks.report import summarize, print_table, write_json
+
+SCENARIOS = ("voice", "canvas", "screen", "screen_batch")
+
+
+class Backends:
+    """The set of fake clients shared by one benchmark run"""
+
+    def __init__(self, latency_scale=1.0, seed=0):
+        def latency(median, offset):
+            return LatencyModel(median=median, scale=latency_scale, seed=seed + offset)
+
+        self.model = FakeGenerativeModel(latency=latency(0.6, 1), seed=seed)
+        self.genai_client = FakeGenaiClient(latency=latency(0.4, 2), seed=seed)
+        self.speech_client = FakeSpeechClient(latency=latency(0.8, 3), seed=seed)
+        self.tts_client = FakeTextToSpeechClient(latency=latency(0.5, 4), seed=seed)
+
+    def wire(self):
+        return {
+            "gemini": self.model.wire.snapshot(),
+            "genai_client": self.genai_client.wire.snapshot(),
+            "speech": self.speech_client.wire.snapshot(),
+            "tts": self.tts_client.wire.snapshot(),
+        }
+
+
+class StageTimer:
+    """Collects per-stage wall-clock durations"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def run(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+
+
+def synthetic_audio(seconds, sample_rate=44100, chunk=1024):
+    """Float32 chunks shaped like sounddevice callback buffers"""
+    t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+    signal = (0.2 * np.sin(2 * np.pi * 220 * t)).astype(np.float32).reshape(-1, 1)
+    return [signal[i:i + chunk] for i in range(0, len(signal), chunk)]
+
+
+def synthetic_canvas(width=900, height=800, strokes=12, seed=0):
+    """RGBA canvas array with a few dark strokes, like st_canvas image_data"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 4), 255, dtype=np.uint8)
+    for _ in range(strokes):
+        x0, y0 = rng.integers(0, width - 120), rng.integers(0, height - 20)
+        image[y0:y0 + 5, x0:x0 + 120, :3] = 0
+    return image
+
+
+def _remove(path):
+    if path and os.path.exists(path):
+        os.unlink(path)
+
+
+def voice_interaction(backends, timer, audio_seconds=4.0):
+    """record -> transcribe -> respond -> speak"""
+    recorder = AudioRecorder()
+
+    def record():
+        recorder.recording = synthetic_audio(audio_seconds, recorder.sample_rate)
+        recorder.is_recording = True
+        recorder.stream = NullInputStream()
+        return recorder.stop_recording()
+
+    audio_file = timer.run("record", record)
+    text = timer.run("transcribe", transcribe_audio, audio_file, "en-US", backends.speech_client)
+    reply = timer.run("respond", get_ai_response, text, "English", backends.model)
+    speech = timer.run("speak", text_to_speech, reply, "en-US", "en-US-Studio-O", backends.tts_client)
+    _remove(speech)
+
+
+def canvas_interaction(backends, timer, seed=0):
+    """canvas -> analyze -> speak"""
+    # Skip Whiteboard.__init__: it only seeds Streamlit session state
+    whiteboard = Whiteboard.__new__(Whiteboard)
+    canvas_result = SimpleNamespace(image_data=synthetic_canvas(seed=seed).astype(np.float32) / 255)
+
+    def encode():
+        image = whiteboard.get_image(canvas_result)
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as temp_file:
+            image.save(temp_file.name)
+            return temp_file.name
+
+    path = timer.run("encode_canvas", encode)
+    try:
+        context = "Subject: Mathematics, Topic: Algebra, Level: Intermediate"
+        feedback = timer.run("analyze", analyze_drawing, path, context, backends.model)
+    finally:
+        _remove(path)
+    speech = timer.run("speak", text_to_speech, feedback, "en-US", "en-US-Studio-O", backends.tts_client)
+    _remove(speech)
+
+
+def screen_interaction(backends, timer, seed=0):
+    """canvas -> ScreenAnalyzer.analyze_screen on the in-memory image"""
+    analyzer = ScreenAnalyzer(client=backends.genai_client)
+    whiteboard = Whiteboard.__new__(Whiteboard)
+    canvas_result = SimpleNamespace(image_data=synthetic_canvas(seed=seed).astype(np.float32) / 255)
+    image = timer.run("encode_canvas", whiteboard.get_image, canvas_result)
+    timer.run("analyze_screen", analyzer.analyze_screen, image)
+
+
+def screen_batch_interaction(backends, timer, seed=0, expressions=8):
+    """Several canvases -> one packed ScreenAnalyzer.analyze_batch request"""
+    analyzer = ScreenAnalyzer(client=backends.genai_client)
+    canvases = [synthetic_canvas(width=300, height=120, strokes=3, seed=seed + i) for i in range(expressions)]
+    timer.run("analyze_batch", analyzer.analyze_batch, canvases)
+
+
+INTERACTIONS = {
+    "voice": voice_interaction,
+    "canvas": canvas_interaction,
+    "screen": screen_interaction,
+    "screen_batch": screen_batch_interaction,
+}
+
+
+def disable_rate_limit(concurrency=1):
+    """Swap in a caller whose limiter never throttles the benchmark itself"""
+    resilience.gemini_caller = ResilientCaller(
+        bucket=TokenBucket(rate=1e6, capacity=1e6),
+        max_in_flight=max(8, concurrency),
+    )
+
+
+def run_latency(scenario, backends, iterations, concurrency):
+    timer = StageTimer()
+    interaction = INTERACTIONS[scenario]
+    # Separate fakes keep the warm-up out of the wire counts
+    interaction(Backends(latency_scale=0), StageTimer())
+
+    def one(_):
+        timer.run("total", interaction, backends, timer)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(iterations)))
+    return {stage: summarize(samples) for stage, samples in timer.samples.items()}
+
+
+def run_allocations(scenario, backends, iterations):
+    """Peak and retained Python allocations per interaction, run sequentially"""
+    interaction = INTERACTIONS[scenario]
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            interaction(backends, StageTimer())
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_mean": sum(peaks) / len(peaks),
+        "peak_bytes_max": max(peaks),
+        "retained_bytes_mean": sum(retained) / len(retained),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--alloc-iterations", type=int, default=5,
+                        help="Sequential iterations traced for allocations (0 to skip)")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="Multiply fake backend latencies (0 measures local overhead only)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="Keep the production client-side rate limiter in the loop")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args(argv)
+
+    if not args.rate_limit:
+        disable_rate_limit(args.concurrency)
+
+    report = {"config": vars(args), "scenarios": {}}
+    for scenario in args.scenario or SCENARIOS:
+        backends = Backends(latency_scale=args.latency_scale, seed=args.seed)
+        start = time.perf_counter()
+        latency = run_latency(scenario, backends, args.iterations, args.concurrency)
+        elapsed = time.perf_counter() - start
+        wire = backends.wire()
+        result = {
+            "latency": latency,
+            "throughput_per_s": args.iterations / elapsed if elapsed else None,
+            "wire": wire,
+        }
+        if args.alloc_iterations:
+            result["allocations"] = run_allocations(
+                scenario, Backends(latency_scale=0, seed=args.seed), args.alloc_iterations
+            )
+        report["scenarios"][scenario] = result
+
+        print_table(f"{scenario} ({args.iterations} iterations, concurrency {args.concurrency})", latency)
+        for backend, counts in wire.items():
+            if counts["calls"]:
+                print(f"  wire {backend:<13} calls={counts['calls']:<5} "
+                      f"sent={counts['bytes_sent'] / args.iterations:,.0f} B/iter "
+                      f"received={counts['bytes_received'] / args.iterations:,.0f} B/iter")
+        if "allocations" in result:
+            alloc = result["allocations"]
+            print(f"  alloc peak={alloc['peak_bytes_mean'] / 1024:,.0f} KiB/iter "
+                  f"retained={alloc['retained_bytes_mean'] / 1024:,.1f} KiB/iter")
+
+    if args.json:
+        write_json(args.json, report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Replay captured tutoring traces against local stand-ins.
+
+Feeds every interaction recorded with GENIE_TRACE_DIR (see trace_capture.py)
+through the same ai_utils/audio_utils calls the app makes, with fake Gemini,
+Speech-to-Text and Text-to-Speech backends, and reports per-stage latency
+from telemetry. Interactions start at their original offsets divided by
+--speed (1 is real time, 0 replays back to back). Save a report with --json
+on one build and pass it as --baseline on another to compare.
+
+    python -m benchmarks.replay traces --speed 10 --json before.json
+    python -m benchmarks.replay traces --speed 10 --baseline before.json
+
+Fake backend latency is off by default so differences come from local code;
+--latency-scale 1 adds the pipeline benchmark's modelled service latency.
+Gemini calls go through a ModelRouter whose tiers are fakes, as in production
+(--no-router, or GENIE_MODEL_ROUTING=0, uses a single fake model). One
+interaction of each kind runs untimed first, so first-use imports and client
+loads do not land in the timed stages.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import telemetry
+from ai_utils import get_ai_response, analyze_drawing, generate_practice_problem
+from answer_cache import answer_cache
+from audio_utils import transcribe_audio, text_to_speech
+from model_router import ModelRouter, routing_enabled
+from trace_capture import load_traces
+
+from benchmarks.fakes import LatencyModel, FakeGenerativeModel
+from benchmarks.pipeline import Backends, disable_rate_limit, synthetic_canvas
+from benchmarks.report import summarize, print_table, write_json
+
+NO_SPEECH = "No speech detected"
+
+# Interaction kinds written by app.py
+KINDS = ("chat", "voice", "canvas", "practice_problem", "solution")
+
+
+class FakeTierRouter(ModelRouter):
+    """ModelRouter whose tiers answer from fake models, so route stages are replayed too"""
+
+    def __init__(self, tiers, latency_scale=0.0, seed=0):
+        super().__init__(tiers)
+        for offset, tier in enumerate(self.tiers):
+            latency = LatencyModel(median=0.6, scale=latency_scale, seed=seed + 10 + offset)
+            self.models.setdefault(tier.model, FakeGenerativeModel(tier.model, latency=latency, seed=seed))
+
+    def _model(self, tier):
+        return self.models[tier.model]
+
+    def wire(self):
+        return {model: fake.wire.snapshot() for model, fake in self.models.items()}
+
+
+class Replayer:
+    """Runs recorded interactions through the app's code paths"""
+
+    def __init__(self, directory, backends, model=None):
+        self.directory = directory
+        self.backends = backends
+        self.model = model or backends.model
+
+    def _materialize(self, ref, suffix):
+        """Temp file holding a recorded blob, or a stand-in when media was not kept"""
+        temp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+        with temp:
+            if ref and "blob" in ref:
+                with open(os.path.join(self.directory, ref["blob"]), "rb") as f:
+                    shutil.copyfileobj(f, temp)
+            elif suffix == ".png":
+                from PIL import Image
+                Image.fromarray(synthetic_canvas()).save(temp, format="PNG")
+            else:
+                temp.write(b"\0" * (ref or {}).get("bytes", 0))
+        return temp.name
+
+    def _speak(self, text, params):
+        speech = text_to_speech(text, params.get("lang_code", "en-US"),
+                                params.get("voice", "en-US-Studio-O"), self.backends.tts_client)
+        _remove(speech)
+
+    def _scope(self, params):
+        scope = params.get("cache_scope")
+        return tuple(scope) if scope else None
+
+    def chat(self, record):
+        params, inputs = record["params"], record["inputs"]
+        get_ai_response(inputs.get("text", ""), params.get("language", "English"),
+                        self.model, cache_scope=self._scope(params))
+
+    def voice(self, record):
+        params, inputs, outputs = record["params"], record["inputs"], record["outputs"]
+        if "audio" in inputs:
+            # transcribe_audio deletes the file it is given
+            path = self._materialize(inputs["audio"], ".wav")
+            transcribe_audio(path, params.get("lang_code", "en-US"), self.backends.speech_client)
+        text = inputs.get("text")
+        if not text or text == NO_SPEECH:
+            return
+        reply = get_ai_response(text, params.get("language", "English"),
+                                self.model, cache_scope=self._scope(params))
+        self._speak(outputs.get("reply") or reply, params)
+
+    def canvas(self, record):
+        params, inputs, outputs = record["params"], record["inputs"], record["outputs"]
+        path = self._materialize(inputs.get("image"), ".png")
+        try:
+            result = analyze_drawing(path, inputs.get("context", ""), self.model)
+        finally:
+            _remove(path)
+        if result:
+            self._speak(outputs.get("reply") or result, params)
+
+    def practice_problem(self, record):
+        subject, topic, difficulty = record["params"].get("cache_scope") or ("Mathematics", "Algebra", "Intermediate")
+        generate_practice_problem(subject, topic, difficulty, self.model)
+
+    def solution(self, record):
+        params = record["params"]
+        subject, _, difficulty = params.get("cache_scope") or ("Mathematics", "Algebra", "Intermediate")
+        # Same prompt as app.generate_solution_response
+        prompt = (f"Provide a detailed, step-by-step solution for the following problem, appropriate for a "
+                  f"student learning {subject} at a {difficulty} level:\n\nProblem: {record['inputs'].get('problem', '')}")
+        # No cache_scope, as in the app: the shared template would make different problems look alike
+        get_ai_response(prompt, params.get("language", "English"), self.model)
+
+    def run(self, record):
+        if record["kind"] not in KINDS:
+            raise ValueError(f"Unknown interaction kind: {record['kind']}")
+        getattr(self, record["kind"])(record)
+
+
+def _remove(path):
+    if path and os.path.exists(path):
+        os.unlink(path)
+
+
+class StageCollector:
+    """Telemetry sink gathering span durations by stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        with self.lock:
+            self.samples[event["stage"]].append(event["duration_ms"] / 1000)
+            if event["status"] != "ok":
+                self.errors[event["stage"]] += 1
+
+    def add(self, stage, seconds):
+        with self.lock:
+            self.samples[stage].append(seconds)
+
+
+def recorded_stages(records):
+    """Stage durations as captured in production, for reference"""
+    samples = defaultdict(list)
+    for record in records:
+        samples[f"interaction:{record['kind']}"].append(record["duration_ms"] / 1000)
+        for stage in record["stages"]:
+            samples[stage["stage"]].append(stage["duration_ms"] / 1000)
+    return {stage: summarize(values) for stage, values in samples.items()}
+
+
+def warm(replayer, records):
+    """Run the first interaction of each kind untimed, so lazy imports and loads happen here"""
+    seen = set()
+    for record in records:
+        if record["kind"] in seen:
+            continue
+        seen.add(record["kind"])
+        try:
+            replayer.run(record)
+        except Exception:
+            # The timed run hits the same error and counts it
+            pass
+
+
+def replay(directory, records, backends, speed=0.0, concurrency=8, model=None):
+    """Replay records at their original pacing divided by speed; returns stage summaries"""
+    replayer = Replayer(directory, backends, model)
+    collector = StageCollector()
+    lags = []
+    failures = defaultdict(int)
+    origin = records[0]["started"] if records else 0.0
+
+    def one(record, scheduled):
+        start = time.perf_counter()
+        lags.append(max(0.0, start - scheduled))
+        try:
+            replayer.run(record)
+        except Exception:
+            with collector.lock:
+                failures[record["kind"]] += 1
+        collector.add(f"interaction:{record['kind']}", time.perf_counter() - start)
+
+    telemetry.enable()
+    warm(replayer, records)
+    # Each build starts from an empty answer cache so runs are comparable
+    answer_cache.clear()
+    telemetry.add_sink(collector)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            begin = time.perf_counter()
+            for record in records:
+                scheduled = begin + ((record["started"] - origin) / speed if speed else 0.0)
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(one, record, scheduled)
+    finally:
+        telemetry.remove_sink(collector)
+    return {
+        "stages": {stage: summarize(values) for stage, values in collector.samples.items()},
+        "stage_errors": dict(collector.errors),
+        "failures": dict(failures),
+        "start_lag": summarize(lags),
+    }
+
+
+def compare(current, baseline, threshold):
+    """Stages whose p50 or p95 grew by more than threshold (a fraction) over the baseline"""
+    regressions = []
+    print("\n== compared with baseline ==")
+    print(f"{'stage':<26}{'p50 ms':>10}{'base':>10}{'Δ%':>8}{'p95 ms':>10}{'base':>10}{'Δ%':>8}")
+    for stage, summary in sorted(current.items()):
+        base = baseline.get(stage)
+        if not summary.get("count") or not base or not base.get("count"):
+            continue
+        row = f"{stage:<26}"
+        for key in ("p50_ms", "p95_ms"):
+            change = (summary[key] - base[key]) / base[key] if base[key] else 0.0
+            row += f"{summary[key]:>10.1f}{base[key]:>10.1f}{change * 100:>+8.1f}"
+            if change > threshold:
+                regressions.append((stage, key, change))
+        print(row)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace_dir", help="Directory written with GENIE_TRACE_DIR")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Pacing multiplier: 1 is real time, 10 is ten times faster, 0 is back to back")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--kind", action="append", choices=KINDS, help="Only replay this interaction kind (repeatable)")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="Multiply fake backend latencies (default 0: local overhead only)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate-limit", action="store_true",
+                        help="Keep the production client-side rate limiter in the loop")
+    parser.add_argument("--no-router", action="store_true",
+                        help="Send Gemini calls to a single fake model instead of the tier router")
+    parser.add_argument("--baseline", help="Report from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Fractional p50/p95 growth over the baseline that counts as a regression")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args(argv)
+
+    records = load_traces(args.trace_dir)
+    if args.kind:
+        records = [record for record in records if record["kind"] in args.kind]
+    if not records:
+        parser.error(f"No traced interactions in {args.trace_dir}")
+
+    if not args.rate_limit:
+        disable_rate_limit(args.concurrency)
+    backends = Backends(latency_scale=args.latency_scale, seed=args.seed)
+    router = None
+    if routing_enabled() and not args.no_router:
+        router = FakeTierRouter(ModelRouter.from_env().tiers, latency_scale=args.latency_scale, seed=args.seed)
+
+    start = time.perf_counter()
+    result = replay(args.trace_dir, records, backends, speed=args.speed, concurrency=args.concurrency, model=router)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "config": vars(args),
+        "interactions": len(records),
+        "elapsed_s": elapsed,
+        "recorded": recorded_stages(records),
+        "wire": dict(backends.wire(), router=router.wire() if router else None),
+        **result,
+    }
+    print_table(f"replay of {len(records)} interactions (speed {args.speed or 'max'})", result["stages"])
+    lag = result["start_lag"]
+    if lag.get("count"):
+        print(f"  start lag p95={lag['p95_ms']:.1f} ms (replay falling behind the recorded pacing)")
+    for kind, count in result["failures"].items():
+        print(f"  {count} {kind} interaction(s) raised")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(result["stages"], baseline.get("stages", {}), args.threshold)
+        report["regressions"] = [{"stage": s, "metric": m, "change": c} for s, m, c in regressions]
+        for stage, metric, change in regressions:
+            print(f"  REGRESSION {stage} {metric} +{change * 100:.0f}%")
+
+    if args.json:
+        write_json(args.json, report)
+    if regressions:
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import json
+import math
+
+
+def percentile(samples, quantile):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """p50/p95/p99/mean/max of latency samples, in milliseconds"""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "mean_ms": sum(samples) / len(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def print_table(title, rows):
+    """Print stage summaries as a fixed-width table"""
+    print(f"\n== {title} ==")
+    print(f"{'stage':<22}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, summary in rows.items():
+        if not summary.get("count"):
+            continue
+        print(
+            f"{name:<22}{summary['count']:>6}{summary['p50_ms']:>10.1f}"
+            f"{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}{summary['max_ms']:>10.1f}"
+        )
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
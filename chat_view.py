@@ -0,0 +1,122 @@
+"""Chat transcript rendering with per-message HTML cached on the record.
+
+Each conversation_history entry carries its escaped HTML under "html", built
+once when the message is added, so a rerun only joins strings for the visible
+page. Page styles live in one stylesheet instead of inline styles.
+"""
+import html
+import re
+from datetime import datetime
+from functools import lru_cache
+
+CHAT_PAGE_SIZE = 15
+
+# Stylesheet shared by every page element. Streamlit drops elements that a
+# rerun doesn't emit again, so this goes out as one block per rerun; it is
+# built once per process.
+BASE_CSS = """
+div[data-testid="stColumn"] > div > div > button {
+    margin-top: 20px;
+    float: right;
+}
+.stCanvas > div {
+    border: 3px solid #4285F4 !important;
+    border-radius: 10px !important;
+    box-shadow: 0 4px 12px rgba(66, 133, 244, 0.3) !important;
+    background-color: white !important;
+    margin: 20px 0 !important;
+}
+.stCanvas canvas {
+    border-radius: 8px !important;
+    background-color: white !important;
+}
+.genie-msg {
+    padding: 15px;
+    border-radius: 15px;
+    margin: 10px 0;
+}
+.genie-student {
+    background-color: #e3f2fd;
+    margin-left: 50px;
+    border-left: 4px solid #2196f3;
+}
+.genie-tutor {
+    background-color: #f8f9fa;
+    margin-right: 50px;
+    border-left: 4px solid #4caf50;
+}
+"""
+
+# Google Assistant-like button styling, only when voice is available
+VOICE_BUTTON_CSS = """
+div.stButton > button {
+    border-radius: 50%;
+    height: 80px;
+    width: 80px;
+    font-size: 24px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin: 0 auto;
+    background-color: #4285F4;
+    color: white;
+    border: none;
+}
+div.stButton > button:hover {
+    background-color: #3367D6;
+    border: none;
+}
+div.stButton > button:active {
+    background-color: #ea4335;
+}
+"""
+
+ROLE_LABELS = {
+    "student": ("genie-student", "👤 You:"),
+    "tutor": ("genie-tutor", "🧠 Tutor:"),
+}
+
+BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+@lru_cache(maxsize=2)
+def page_css(voice_enabled):
+    """The page's single <style> block"""
+    css = BASE_CSS + (VOICE_BUTTON_CSS if voice_enabled else "")
+    # Collapse whitespace so the block is one short line on the wire
+    return "<style>" + re.sub(r"\s+", " ", css).strip() + "</style>"
+
+
+def render_message(message):
+    """Escaped HTML for one chat message, cached on the message record"""
+    cached = message.get("html")
+    if cached is None:
+        css_class, label = ROLE_LABELS.get(message["role"], ROLE_LABELS["tutor"])
+        body = html.escape(str(message["content"]))
+        body = BOLD.sub(r"<strong>\1</strong>", body).replace("\n", "<br>")
+        cached = message["html"] = f"<div class='genie-msg {css_class}'><strong>{label}</strong> {body}</div>"
+    return cached
+
+
+def new_message(role, content):
+    """Conversation history record with its HTML pre-rendered"""
+    message = {"role": role, "content": content, "timestamp": datetime.now()}
+    render_message(message)
+    return message
+
+
+def without_html(messages):
+    """Messages minus their cached HTML, for storage; render_message rebuilds it"""
+    return [{k: v for k, v in message.items() if k != "html"} for message in messages]
+
+
+def page_bounds(total, page, page_size=CHAT_PAGE_SIZE):
+    """Slice [start, end) for a page counted back from the newest messages"""
+    end = max(0, total - page * page_size)
+    return max(0, end - page_size), end
+
+
+def render_chat_html(messages, page=0, page_size=CHAT_PAGE_SIZE):
+    """One HTML string for a page of messages, joined without blank lines"""
+    start, end = page_bounds(len(messages), page, page_size)
+    return "".join(render_message(message) for message in messages[start:end])
@@ -0,0 +1,393 @@
+"""Local exact answers for plain arithmetic and single-variable equations.
+
+Handles inputs like "12*17", "what is 2^10?" or "solve 3x+5=20" without a
+model round trip. Anything the parser is not sure about (words, several
+variables, division by a variable, irrational roots, huge powers) returns
+None so the caller falls through to the model.
+
+Answers go straight to students, so EXAMPLES pins the expected result of
+the tricky cases; `python -m fast_math` checks solve() against it.
+"""
+import math
+import re
+import sys
+import threading
+from collections import namedtuple
+from fractions import Fraction
+
+import telemetry
+
+FastAnswer = namedtuple("FastAnswer", ["expression", "answer", "steps"])
+
+PREFIX = re.compile(
+    r"^\s*(?:what\s+is|what's|whats|calculate|compute|evaluate|solve(?:\s+for\s+[a-z])?|"
+    r"find\s+[a-z](?:\s+(?:if|when|in))?)\s*:?\s*",
+    re.IGNORECASE,
+)
+SUFFIX = re.compile(r"(?:\s*,?\s*(?:solve\s+)?for\s+[a-z])?\s*(?:please)?\s*[?.!]*\s*$", re.IGNORECASE)
+TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?|\.\d+)|([a-zA-Z])|(\*\*|[-+*/^()=]))")
+SYMBOLS = {"×": "*", "·": "*", "÷": "/", "−": "-", "–": "-", "²": "^2", "³": "^3"}
+
+MAX_DEGREE = 2
+MAX_EXPONENT = 100
+MAX_BITS = 4096
+
+_lock = threading.Lock()
+_stats = {"handled": 0, "fell_through": 0}
+
+
+class Unsupported(Exception):
+    """Raised when an input is outside what the fast path answers confidently"""
+
+
+# Polynomials in one variable are dicts of degree -> Fraction coefficient
+
+def _poly(constant=0, degree=0):
+    return {degree: Fraction(constant)} if constant else {}
+
+
+def _check(poly):
+    for degree, coef in poly.items():
+        if degree > MAX_DEGREE:
+            raise Unsupported("degree too high")
+        if coef.numerator.bit_length() > MAX_BITS or coef.denominator.bit_length() > MAX_BITS:
+            raise Unsupported("number too large")
+    return poly
+
+
+def _add(a, b, sign=1):
+    result = dict(a)
+    for degree, coef in b.items():
+        result[degree] = result.get(degree, 0) + sign * coef
+    return {d: c for d, c in result.items() if c}
+
+
+def _mul(a, b):
+    result = {}
+    for da, ca in a.items():
+        for db, cb in b.items():
+            if da + db > MAX_DEGREE:
+                raise Unsupported("degree too high")
+            result[da + db] = result.get(da + db, 0) + ca * cb
+    return _check({d: c for d, c in result.items() if c})
+
+
+def _constant(poly):
+    if any(degree for degree in poly):
+        raise Unsupported("not a constant")
+    return poly.get(0, Fraction(0))
+
+
+def _pow(base, exponent):
+    n = _constant(exponent)
+    if n.denominator != 1 or abs(n) > MAX_EXPONENT:
+        raise Unsupported("unsupported exponent")
+    n = int(n)
+    if n < 0:
+        value = _constant(base)
+        if value == 0:
+            raise Unsupported("division by zero")
+        bits = max(value.numerator.bit_length(), value.denominator.bit_length())
+        if bits * -n > MAX_BITS:
+            raise Unsupported("number too large")
+        return _poly(value ** n)
+    if all(degree == 0 for degree in base):
+        value = base.get(0, Fraction(0))
+        bits = max(value.numerator.bit_length(), value.denominator.bit_length())
+        if bits * n > MAX_BITS:
+            raise Unsupported("number too large")
+        return _poly(value ** n)
+    result = _poly(1)
+    for _ in range(n):
+        result = _mul(result, base)
+    return result
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.variable = None
+        self.operators = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        if self.take() != ("op", value):
+            raise Unsupported(f"expected {value}")
+
+    def expression(self):
+        left = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            sign = 1 if self.take()[1] == "+" else -1
+            self.operators += 1
+            left = _add(left, self.term(), sign)
+        return left
+
+    def term(self):
+        left = self.unary()
+        while True:
+            token = self.peek()
+            if token in (("op", "*"), ("op", "/")):
+                self.take()
+                self.operators += 1
+                right = self.unary()
+                if token[1] == "*":
+                    left = _mul(left, right)
+                else:
+                    divisor = _constant(right)
+                    if divisor == 0:
+                        raise Unsupported("division by zero")
+                    left = _check({d: c / divisor for d, c in left.items()})
+            elif token is not None and (token[0] == "var" or token == ("op", "(")):
+                # Implicit multiplication: 3x, 2(x + 1), (x + 1)(x - 1)
+                self.operators += 1
+                left = _mul(left, self.unary())
+            else:
+                return left
+
+    def unary(self):
+        token = self.peek()
+        if token in (("op", "-"), ("op", "+")):
+            self.take()
+            value = self.unary()
+            return {d: -c for d, c in value.items()} if token[1] == "-" else value
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        if self.peek() in (("op", "^"), ("op", "**")):
+            self.take()
+            self.operators += 1
+            return _pow(base, self.unary())
+        return base
+
+    def atom(self):
+        token = self.take()
+        if token is None:
+            raise Unsupported("unexpected end")
+        kind, value = token
+        if kind == "num":
+            return _check(_poly(Fraction(value)))
+        if kind == "var":
+            if self.variable not in (None, value):
+                raise Unsupported("more than one variable")
+            self.variable = value
+            return {1: Fraction(1)}
+        if value == "(":
+            inner = self.expression()
+            self.expect(")")
+            return inner
+        raise Unsupported(f"unexpected {value}")
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if not match:
+            raise Unsupported("unexpected character")
+        number, letter, op = match.groups()
+        if number is not None:
+            tokens.append(("num", number))
+        elif letter is not None:
+            tokens.append(("var", letter.lower()))
+        else:
+            tokens.append(("op", op))
+        pos = match.end()
+    return tokens
+
+
+def _clean(text):
+    text = text.strip()
+    for symbol, replacement in SYMBOLS.items():
+        text = text.replace(symbol, replacement)
+    text = PREFIX.sub("", text, count=1)
+    text = SUFFIX.sub("", text, count=1)
+    return re.sub(r"\s+equals\s+", " = ", text, flags=re.IGNORECASE).strip()
+
+
+def format_number(value):
+    """Exact integer/decimal, or a fraction with its decimal approximation"""
+    if value.denominator == 1:
+        return str(value.numerator)
+    denominator = value.denominator
+    places = 0
+    for factor in (2, 5):
+        count = 0
+        while denominator % factor == 0:
+            denominator //= factor
+            count += 1
+        places = max(places, count)
+    if denominator == 1:
+        # Terminating decimal: print it exactly
+        scaled = abs(value.numerator) * 10 ** places // value.denominator
+        digits = str(scaled).rjust(places + 1, "0")
+        sign = "-" if value < 0 else ""
+        return f"{sign}{digits[:-places]}.{digits[-places:]}"
+    return f"{value.numerator}/{value.denominator} ≈ {float(value):.6g}"
+
+
+def _format_term(coef, variable, degree):
+    if degree == 0:
+        return format_number(coef).split(" ≈ ")[0]
+    name = variable if degree == 1 else f"{variable}^{degree}"
+    if coef == 1:
+        return name
+    if coef == -1:
+        return f"-{name}"
+    text = format_number(coef).split(" ≈ ")[0]
+    return f"({text}){name}" if "/" in text else f"{text}{name}"
+
+
+def format_poly(poly, variable):
+    terms = [_format_term(poly[d], variable, d) for d in sorted(poly, reverse=True)]
+    if not terms:
+        return "0"
+    text = terms[0]
+    for term in terms[1:]:
+        text += f" - {term[1:]}" if term.startswith("-") else f" + {term}"
+    return text
+
+
+def _exact_sqrt(value):
+    if value < 0:
+        return None
+    num, den = math.isqrt(value.numerator), math.isqrt(value.denominator)
+    if num * num != value.numerator or den * den != value.denominator:
+        return None
+    return Fraction(num, den)
+
+
+def _solve_equation(left, right, variable, expression):
+    poly = _add(left, right, -1)
+    degree = max(poly, default=0)
+    if variable is None or degree == 0:
+        raise Unsupported("nothing to solve")
+    if degree == 1:
+        a, b = poly[1], poly.get(0, Fraction(0))
+        root = -b / a
+        steps = [f"Collect the {variable} terms on one side: {format_poly({1: a}, variable)} = {format_number(-b).split(' ≈ ')[0]}"]
+        if a != 1:
+            steps.append(f"Divide both sides by {format_number(a).split(' ≈ ')[0]}: {variable} = {format_number(root)}")
+        return FastAnswer(expression, f"{variable} = {format_number(root)}", steps)
+
+    a, b, c = poly[2], poly.get(1, Fraction(0)), poly.get(0, Fraction(0))
+    root_disc = _exact_sqrt(b * b - 4 * a * c)
+    if root_disc is None:
+        raise Unsupported("no rational roots")
+    roots = sorted({(-b - root_disc) / (2 * a), (-b + root_disc) / (2 * a)})
+    answer = " or ".join(f"{variable} = {format_number(root)}" for root in roots)
+    steps = [f"Rearrange: {format_poly(poly, variable)} = 0", f"Solve the quadratic: {answer}"]
+    return FastAnswer(expression, answer, steps)
+
+
+def solve(text):
+    """FastAnswer for a pure arithmetic expression or single-variable equation, else None"""
+    if not text or len(text) > 200:
+        return None
+    expression = _clean(text)
+    if not expression or re.search(r"[a-zA-Z]{2,}", expression):
+        return None
+    try:
+        sides = expression.split("=")
+        if len(sides) > 2:
+            return None
+        parsed = []
+        tokens = []
+        for side in sides:
+            tokens.append(_tokenize(side))
+            parser = _Parser(tokens[-1])
+            # Both sides must use the same variable
+            parser.variable = parsed[0][1] if parsed else None
+            value = parser.expression()
+            if parser.peek() is not None:
+                return None
+            parsed.append((value, parser.variable, parser.operators))
+        if len(sides) == 2:
+            # "x = 5" is more likely a student's answer than something to solve
+            for bare, other in ((0, 1), (1, 0)):
+                if len(tokens[bare]) == 1 and tokens[bare][0][0] == "var" and not any(
+                        kind == "var" for kind, _ in tokens[other]):
+                    return None
+            return _solve_equation(parsed[0][0], parsed[1][0], parsed[1][1], expression)
+        value, variable, operators = parsed[0]
+        # A bare number is more likely an answer to the tutor than a question
+        if variable is not None or operators == 0:
+            return None
+        return FastAnswer(expression, format_number(_constant(value)), [])
+    except (Unsupported, ZeroDivisionError, OverflowError, ValueError):
+        return None
+
+
+def try_solve(text):
+    """solve() that also counts how often the fast path short-circuits"""
+    result = solve(text)
+    outcome = "handled" if result is not None else "fell_through"
+    with _lock:
+        _stats[outcome] += 1
+    telemetry.count("genie_fast_path_total", outcome=outcome)
+    return result
+
+
+def stats():
+    """Counts of inputs answered locally vs passed to the model"""
+    with _lock:
+        return dict(_stats)
+
+
+def tutor_reply(answer, language="English"):
+    """Short tutor message for a locally computed answer.
+
+    The worked steps are English, so other languages get only the result.
+    """
+    if answer.steps and language == "English":
+        lines = [f"Let's solve {answer.expression}:"] + [f"{i}. {step}" for i, step in enumerate(answer.steps, 1)]
+        lines.append(f"So {answer.answer}. Try plugging it back in to check!")
+        return "\n".join(lines)
+    if answer.steps:
+        return f"{answer.expression} ⇒ {answer.answer}"
+    return f"{answer.expression} = {answer.answer}"
+
+
+# Input -> expected solve() answer, or None when the model should answer instead
+EXAMPLES = (
+    ("12*17", "204"),
+    ("2(3)", "6"),                         # implicit multiplication is an operator
+    ("5", None),                           # a bare number is a student's answer
+    ("x = 5", None),                       # so is a bare variable set to a constant
+    ("5 = x", None),
+    ("x/2=3", "x = 6"),
+    ("solve 3x+5=20", "x = 5"),
+    ("2/x=1", None),                       # division by the variable
+    ("x^2-5x+6=0", "x = 2 or x = 3"),
+    ("x^2=2", None),                       # irrational roots
+    ("x + y = 3", None),                   # two variables
+)
+
+
+def check_examples():
+    """(input, expected, got) for every example solve() now gets wrong"""
+    failures = []
+    for text, expected in EXAMPLES:
+        result = solve(text)
+        got = result.answer if result is not None else None
+        if got != expected:
+            failures.append((text, expected, got))
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_examples()
+    for text, expected, got in failures:
+        print(f"{text!r}: expected {expected!r}, got {got!r}")
+    print(f"{len(EXAMPLES) - len(failures)}/{len(EXAMPLES)} examples pass")
+    sys.exit(1 if failures else 0)
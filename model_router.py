@@ -0,0 +1,252 @@
+"""Latency-aware routing of Gemini requests across model tiers.
+
+Each request is scored locally from its task, the student's text and the
+number of images, then sent to the smallest tier whose threshold covers the
+score. Each tier has its own circuit breaker and shares the process rate
+limit. A transient error, timeout or open circuit falls back to the next
+tier after a single attempt, backing off first if the backend throttled
+us; the last tier in the fallback order keeps the full retry budget.
+Other errors (invalid request, safety block, auth) are raised at once,
+since every tier would refuse them the same way. Every decision is logged on the "genie.router" logger with its score, reasons and
+latency so the thresholds can be tuned.
+
+    GENIE_MODEL_ROUTING=0    disable routing and use a single model
+    GENIE_MODEL_TIERS="fast=gemini-1.5-flash-8b:10:1,standard=gemini-1.5-flash:30:3,advanced=gemini-1.5-pro:60"
+                             name=model:timeout_seconds[:max_score], smallest first
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+import resilience
+from resilience import CallRejected, CircuitOpenError
+import telemetry
+
+logger = logging.getLogger("genie.router")
+
+Tier = namedtuple("Tier", ["name", "model", "timeout", "max_score"])
+
+DEFAULT_TIERS = (
+    Tier("fast", "gemini-1.5-flash-8b", 10.0, 1),
+    Tier("standard", "gemini-1.5-flash", 30.0, 3),
+    Tier("advanced", "gemini-1.5-pro", 60.0, None),
+)
+
+TASK_SCORES = {
+    "chat": 0,
+    "screen": 0,
+    "practice_problem": 1,
+    "analyze_drawing": 2,
+}
+
+HARD_TERMS = {
+    "prove", "proof", "derivative", "derivatives", "differentiate", "integral", "integrals",
+    "integrate", "limit", "limits", "matrix", "matrices", "eigenvalue", "eigenvalues",
+    "theorem", "induction", "differential", "convergence", "series", "vector", "vectors",
+    "calculus", "quantum", "thermodynamics", "electromagnetism", "algorithm", "complexity",
+}
+REASONING_TERMS = {"why", "explain", "steps", "step", "derive", "compare", "how", "justify"}
+SMALL_TALK = {"hi", "hello", "hey", "thanks", "thank", "ok", "okay", "cool", "great", "bye", "yes", "no"}
+
+WORD = re.compile(r"[a-z]+")
+
+
+def routing_enabled():
+    return telemetry.env_flag("GENIE_MODEL_ROUTING", default=True)
+
+
+def parse_tiers(spec):
+    """Tiers from a "name=model:timeout[:max_score],..." string"""
+    tiers = []
+    for part in spec.split(","):
+        name, _, rest = part.strip().partition("=")
+        fields = rest.split(":")
+        if not name or len(fields) < 2:
+            raise ValueError(f"Invalid model tier: {part!r}")
+        max_score = int(fields[2]) if len(fields) > 2 and fields[2] else None
+        tiers.append(Tier(name, fields[0], float(fields[1]), max_score))
+    return tuple(tiers)
+
+
+def classify(task="chat", text="", images=0):
+    """Cheap local complexity score for a request, with the reasons behind it"""
+    reasons = []
+    score = TASK_SCORES.get(task, 1)
+    if score:
+        reasons.append(f"task:{task}")
+    text = (text or "").lower()
+    words = WORD.findall(text)
+
+    if images:
+        bump = 1 if images <= 2 else 2
+        score += bump
+        reasons.append(f"images:{images}")
+    if not images and len(words) <= 4 and set(words) <= SMALL_TALK:
+        return score, reasons + ["small_talk"]
+
+    if len(words) > 120:
+        score += 2
+        reasons.append("long")
+    elif len(words) > 30:
+        score += 1
+        reasons.append("medium")
+
+    vocabulary = set(words)
+    if vocabulary & HARD_TERMS:
+        score += 2
+        reasons.append("hard_terms")
+    if vocabulary & REASONING_TERMS:
+        score += 1
+        reasons.append("reasoning")
+    if "expert" in vocabulary:
+        score += 2
+        reasons.append("expert")
+    elif "advanced" in vocabulary:
+        score += 1
+        reasons.append("advanced")
+    if sum(text.count(symbol) for symbol in "=^∫√") > 3:
+        score += 1
+        reasons.append("symbols")
+    return score, reasons
+
+
+def should_fall_back(exc):
+    """Check whether another tier might answer where this one failed"""
+    if resilience.is_retryable(exc):
+        return True
+    # Client timeouts (httpx, requests) don't subclass TimeoutError
+    return any("Timeout" in cls.__name__ for cls in type(exc).__mro__)
+
+
+class ModelRouter:
+    """Picks a model tier per request and falls back across tiers on failure"""
+
+    model_name = "router"
+
+    def __init__(self, tiers=DEFAULT_TIERS, caller=None):
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.tiers = tuple(tiers)
+        self.caller = caller
+        self.models = {}
+        self.tier_callers = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        spec = os.getenv("GENIE_MODEL_TIERS")
+        return cls(parse_tiers(spec) if spec else DEFAULT_TIERS)
+
+    def choose(self, task="chat", text="", images=0):
+        """Index of the tier for a request, plus its score and reasons"""
+        score, reasons = classify(task, text, images)
+        for index, tier in enumerate(self.tiers):
+            if tier.max_score is None or score <= tier.max_score:
+                return index, score, reasons
+        return len(self.tiers) - 1, score, reasons
+
+    def fallback_order(self, index):
+        """Chosen tier first, then larger tiers, then smaller ones"""
+        return [index] + list(range(index + 1, len(self.tiers))) + list(range(index - 1, -1, -1))
+
+    def tier_caller(self, tier, last=False):
+        """Caller for one tier: a single attempt, or the full retry budget for the last tier tried"""
+        base = self.caller or resilience.gemini_caller
+        with self.lock:
+            # Rebuilt if the shared caller is swapped, e.g. by the benchmarks
+            entry = self.tier_callers.get(tier.name)
+            if entry is None or entry[0] is not base:
+                single = base.derive(max_attempts=1)
+                entry = self.tier_callers[tier.name] = (base, single, base.derive(breaker=single.breaker))
+            return entry[2] if last else entry[1]
+
+    def run(self, invoke, task="chat", text="", images=0):
+        """Call invoke(tier) through the tier's caller, falling back on transient errors"""
+        index, score, reasons = self.choose(task, text, images)
+        order = self.fallback_order(index)
+        error = None
+        for attempt, tier_index in enumerate(order):
+            tier = self.tiers[tier_index]
+            last = attempt == len(order) - 1
+            caller = self.tier_caller(tier, last)
+            start = time.perf_counter()
+            try:
+                with telemetry.span("route", task=task, tier=tier.name, model=tier.model):
+                    result = caller.call(invoke, tier)
+            except CircuitOpenError as e:
+                # Only this tier's circuit is open; the others may be healthy
+                error = e
+                logger.warning("route task=%s tier=%s model=%s skipped: circuit open", task, tier.name, tier.model)
+                continue
+            except CallRejected:
+                # The rate limit is shared by every tier
+                raise
+            except Exception as e:
+                if not should_fall_back(e):
+                    raise
+                error = e
+                logger.warning(
+                    "route task=%s tier=%s model=%s score=%d reasons=%s attempt=%d failed after %.0f ms: %s",
+                    task, tier.name, tier.model, score, ",".join(reasons), attempt,
+                    (time.perf_counter() - start) * 1000, e,
+                )
+                if resilience.is_throttle_error(e) and not last:
+                    # Quota is shared across models, so a larger tier needs the same pause
+                    caller.sleep(caller.backoff(attempt))
+                continue
+            logger.info(
+                "route task=%s tier=%s model=%s score=%d reasons=%s attempt=%d latency_ms=%.0f",
+                task, tier.name, tier.model, score, ",".join(reasons), attempt,
+                (time.perf_counter() - start) * 1000,
+            )
+            return result
+        raise error
+
+    def _model(self, tier):
+        import google.generativeai as genai
+        with self.lock:
+            if tier.model not in self.models:
+                self.models[tier.model] = genai.GenerativeModel(tier.model)
+            return self.models[tier.model]
+
+    def generate(self, contents, task="chat", text="", images=0, **kwargs):
+        """GenerativeModel.generate_content routed across tiers"""
+        def invoke(tier):
+            return self._model(tier).generate_content(
+                contents,
+                request_options={"timeout": tier.timeout},
+                **kwargs,
+            )
+
+        return self.run(invoke, task, text, images)
+
+    def generate_content(self, contents, **kwargs):
+        """Drop-in for GenerativeModel.generate_content, classifying the whole prompt"""
+        text = contents if isinstance(contents, str) else ""
+        images = 0 if isinstance(contents, str) else sum(1 for part in contents if not isinstance(part, str))
+        return self.generate(contents, task="chat", text=text, images=images, **kwargs)
+
+
+def generate(model, contents, task="chat", text="", images=0, **kwargs):
+    """Generate with a ModelRouter or a plain GenerativeModel through the shared caller"""
+    if isinstance(model, ModelRouter):
+        return model.generate(contents, task=task, text=text, images=images, **kwargs)
+    return resilience.gemini_caller.call(model.generate_content, contents, **kwargs)
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Process-wide router, or None when routing is disabled"""
+    global _router
+    if not routing_enabled():
+        return None
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter.from_env()
+        return _router
@@ -0,0 +1,374 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import telemetry
+
+# HTTP / gRPC-mapped status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# google.api_core exception class names that map to transient failures
+RETRYABLE_ERROR_NAMES = {
+    "TooManyRequests",
+    "ResourceExhausted",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "GatewayTimeout",
+}
+
+THROTTLE_ERROR_NAMES = {"TooManyRequests", "ResourceExhausted"}
+
+
+class CallRejected(Exception):
+    """Raised when a call is refused locally instead of being sent"""
+
+
+class CircuitOpenError(CallRejected):
+    """Raised while the circuit breaker is open"""
+
+
+class RateLimitExceeded(CallRejected):
+    """Raised when no rate-limit token could be acquired in time"""
+
+
+def _status_code(exc):
+    code = getattr(exc, "code", None)
+    if code is None:
+        code = getattr(exc, "status_code", None)
+    if callable(code):
+        try:
+            code = code()
+        except Exception:
+            return None
+    code = getattr(code, "value", code)
+    if isinstance(code, tuple):
+        code = code[0]
+    return code if isinstance(code, int) else None
+
+
+def _error_names(exc):
+    return {cls.__name__ for cls in type(exc).__mro__}
+
+
+def is_throttle_error(exc):
+    """Check whether an error means the backend is rate limiting us"""
+    return _status_code(exc) == 429 or bool(_error_names(exc) & THROTTLE_ERROR_NAMES)
+
+
+def is_retryable(exc):
+    """Check whether an error is transient and the call may be retried"""
+    if isinstance(exc, CallRejected):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if _status_code(exc) in RETRYABLE_STATUS_CODES:
+        return True
+    return bool(_error_names(exc) & RETRYABLE_ERROR_NAMES)
+
+
+class TokenBucket:
+    """Adaptive token bucket limiting the request rate of a process.
+
+    The refill rate backs off multiplicatively when the backend throttles
+    us and recovers additively on success (AIMD).
+    """
+
+    def __init__(self, rate=5.0, capacity=10, min_rate=0.5, max_rate=None,
+                 increase=0.1, decrease=0.5, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available right now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout=None):
+        """Wait for a token; return False if none arrived within timeout"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_time = (1 - self.tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+            self.sleep(wait_time)
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+
+
+class CircuitBreaker:
+    """Stop calling a failing backend for a while so replies degrade fast"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Check whether a call may go through, moving open -> half-open on timeout.
+
+        Half-open lets a single trial call through; the rest are rejected
+        until it records a success or failure.
+        """
+        with self.lock:
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self.probing:
+                    return False
+                self.probing = True
+            return True
+
+    def release(self):
+        """Give up an allowed call that ended without a verdict on the backend"""
+        with self.lock:
+            self.probing = False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedging delay"""
+
+    def __init__(self, window=200):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, quantile):
+        with self.lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return ordered[index]
+
+    def __len__(self):
+        return len(self.samples)
+
+
+class ResilientCaller:
+    """Shared wrapper for backend calls.
+
+    Applies a token-bucket rate limit and an in-flight cap, retries
+    transient errors with jittered exponential backoff, optionally sends a
+    hedged duplicate once a call runs past the observed p95 latency, and
+    trips a circuit breaker when the backend keeps failing.
+    """
+
+    def __init__(self, bucket=None, breaker=None, max_in_flight=8, max_attempts=3,
+                 base_delay=0.5, max_delay=8.0, acquire_timeout=10.0, hedge=False,
+                 hedge_quantile=0.95, hedge_min_samples=20, sleep=time.sleep,
+                 clock=time.monotonic, rng=None):
+        self.bucket = bucket or TokenBucket(clock=clock, sleep=sleep)
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.acquire_timeout = acquire_timeout
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.latency = LatencyTracker()
+        self.stats = {"calls": 0, "retries": 0, "hedges": 0, "throttled": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Build a caller configured from GENIE_* environment variables"""
+        rate = float(os.getenv("GENIE_RATE_LIMIT_QPS", "5"))
+        return cls(
+            bucket=TokenBucket(rate=rate, capacity=max(1, int(rate * 2))),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("GENIE_BREAKER_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("GENIE_BREAKER_RESET_SECONDS", "30")),
+            ),
+            max_in_flight=int(os.getenv("GENIE_MAX_IN_FLIGHT", "8")),
+            max_attempts=int(os.getenv("GENIE_MAX_ATTEMPTS", "3")),
+            hedge=telemetry.env_flag("GENIE_HEDGE_REQUESTS"),
+        )
+
+    def derive(self, max_attempts=None, breaker=None):
+        """Caller sharing this one's rate limit and in-flight cap, with its own breaker.
+
+        Used per model tier, so one failing model does not trip the breaker
+        for the others. Pass the same breaker to callers of one tier that
+        differ only in their retry budget.
+        """
+        caller = ResilientCaller(
+            bucket=self.bucket,
+            breaker=breaker or CircuitBreaker(self.breaker.failure_threshold, self.breaker.reset_timeout,
+                                              clock=self.clock),
+            max_attempts=self.max_attempts if max_attempts is None else max_attempts,
+            base_delay=self.base_delay,
+            max_delay=self.max_delay,
+            acquire_timeout=self.acquire_timeout,
+            hedge=self.hedge,
+            hedge_quantile=self.hedge_quantile,
+            hedge_min_samples=self.hedge_min_samples,
+            sleep=self.sleep,
+            clock=self.clock,
+            rng=self.rng,
+        )
+        caller.slots = self.slots
+        return caller
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def snapshot(self):
+        """Copy of the call counters"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff delay for a retry attempt"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def hedge_delay(self):
+        """Delay after which a hedged request is sent, or None if not hedging"""
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_quantile)
+
+    def call(self, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) with rate limiting, retries, hedging and circuit breaking"""
+        self._count("calls")
+        for attempt in range(self.max_attempts):
+            if not self.breaker.allow():
+                self._count("rejected")
+                raise CircuitOpenError("Backend circuit is open")
+            try:
+                result = self._attempt(fn, args, kwargs)
+            except CallRejected:
+                self.breaker.release()
+                self._count("rejected")
+                raise
+            except Exception as exc:
+                if is_throttle_error(exc):
+                    self._count("throttled")
+                    self.bucket.on_throttle()
+                if not is_retryable(exc):
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_attempts - 1:
+                    raise
+                self._count("retries")
+                self.sleep(self.backoff(attempt))
+            else:
+                self.breaker.record_success()
+                self.bucket.on_success()
+                return result
+
+    def _attempt(self, fn, args, kwargs):
+        if not self.bucket.acquire(self.acquire_timeout):
+            raise RateLimitExceeded("Timed out waiting for a rate-limit token")
+        if not self.slots.acquire(timeout=self.acquire_timeout):
+            raise RateLimitExceeded("Too many requests in flight")
+        try:
+            start = self.clock()
+            delay = self.hedge_delay()
+            if delay is None:
+                result = fn(*args, **kwargs)
+            else:
+                result = self._hedged(fn, args, kwargs, delay)
+            self.latency.record(self.clock() - start)
+            return result
+        finally:
+            self.slots.release()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="genie-hedge")
+            return self._executor
+
+    def _hedged(self, fn, args, kwargs, delay):
+        executor = self._get_executor()
+        pending = {executor.submit(fn, *args, **kwargs)}
+        done, pending = wait(pending, timeout=delay)
+        if not done and self.bucket.try_acquire():
+            self._count("hedges")
+            pending.add(executor.submit(fn, *args, **kwargs))
+        error = None
+        while True:
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                raise error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+
+# Process-wide caller shared by every Gemini request
+gemini_caller = ResilientCaller.from_env()
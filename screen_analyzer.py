@@ -1,27 +1,187 @@
 from google import genai
 from google.genai import types
 from PIL import Image
+import io
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 from dotenv import load_dotenv
 
+import resilience
+from model_router import get_router
+import telemetry
+import fast_math
+
+# Used when routing is disabled and SCREEN_ANALYZER_MODEL is not set
+DEFAULT_MODEL = "gemini-2.0-flash-exp"
+
+SYSTEM_INSTRUCTION = "Only return the computed result of the mathematical expression."
+BATCH_INSTRUCTION = (
+    "Each image contains one mathematical expression. Return a JSON array of strings "
+    "with exactly one computed result per image, in the order the images were given."
+)
+
+# Encoded formats that can be sent as-is instead of being decoded and re-encoded
+MAGIC_MIME_TYPES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_env():
+    """Load .env once per process"""
+    load_dotenv()
+
+
+def get_client():
+    """Process-wide GenAI client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _load_env()
+                _client = genai.Client(
+                    api_key=os.getenv("GOOGLE_API_KEY"),
+                    http_options={"api_version": "v1alpha"},
+                )
+    return _client
+
+
+def to_image_part(image):
+    """Request content for a file path, PIL image, NumPy array or encoded image bytes"""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        data = bytes(image)
+        for magic, mime_type in MAGIC_MIME_TYPES:
+            if data.startswith(magic):
+                return types.Part.from_bytes(data=data, mime_type=mime_type)
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
+    if isinstance(image, np.ndarray):
+        if image.dtype != np.uint8:
+            # Float canvases hold values in [0, 1]
+            scale = 255 if image.size and image.max() <= 1.0 else 1
+            image = np.clip(image * scale, 0, 255).astype(np.uint8)
+        return Image.fromarray(image)
+    if isinstance(image, Image.Image):
+        return image
+    with Image.open(image) as img:
+        img.load()
+        return img
+
+
+def parse_batch_results(text, expected):
+    """List of `expected` results from a JSON array reply, or None if it doesn't fit"""
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end < start:
+        return None
+    try:
+        results = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(results, list) or len(results) != expected:
+        return None
+    return [str(result).strip() for result in results]
+
 
 class ScreenAnalyzer:
-    def __init__(self):
-        """Initialize the ScreenAnalyzer with the GenAI client."""
-        load_dotenv()
-        self.client = genai.Client(
-            api_key=os.getenv("GOOGLE_API_KEY"),
-            http_options={"api_version": "v1alpha"},
-        )
-
-    def analyze_screen(self, image_path):
-        """Analyzes only the whiteboard content."""
-        with Image.open(image_path) as img:
+    def __init__(self, client=None, model=None, router=None):
+        """Initialize the ScreenAnalyzer with the shared GenAI client.
+
+        Requests are routed across model tiers unless a model is given
+        explicitly (or via SCREEN_ANALYZER_MODEL) or routing is disabled.
+        """
+        self.client = client or get_client()
+        # Read after .env is loaded, so a model configured only there is honoured
+        _load_env()
+        configured = os.getenv("SCREEN_ANALYZER_MODEL")
+        self.model = model or configured or DEFAULT_MODEL
+        if router is None and not (model or configured):
+            router = get_router()
+        self.router = router
+
+    def _generate(self, contents, instruction, json_output=False, images=1):
+        def invoke(model, timeout=None):
+            config = types.GenerateContentConfig(
+                system_instruction=instruction,
+                response_mime_type="application/json" if json_output else None,
+                http_options=types.HttpOptions(timeout=int(timeout * 1000)) if timeout else None,
+            )
             response = self.client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=["Analyze the mathematical expression in this image.", img],
-                config=types.GenerateContentConfig(
-                    system_instruction="Only return the computed result of the mathematical expression.",
-                ),
+                model=model,
+                contents=contents,
+                config=config,
             )
-        return response.text
+            return response.text
+
+        if self.router is None:
+            return resilience.gemini_caller.call(invoke, self.model)
+        # The router wraps each tier in its own single-attempt caller
+        text = " ".join(part for part in contents if isinstance(part, str))
+        return self.router.run(lambda tier: invoke(tier.model, tier.timeout), "screen", text, images)
+
+    def analyze_screen(self, image):
+        """Analyzes only the whiteboard content.
+
+        image may be a file path, a PIL image, a NumPy array or encoded image bytes.
+        """
+        with telemetry.span("analyze_screen", mode="single"):
+            return self._generate(
+                ["Analyze the mathematical expression in this image.", to_image_part(image)],
+                SYSTEM_INSTRUCTION,
+            )
+
+    def evaluate_expression(self, expression):
+        """Computed result of a typed expression, answered locally when possible"""
+        answer = fast_math.try_solve(expression)
+        if answer is not None:
+            return answer.answer
+        with telemetry.span("analyze_screen", mode="text"):
+            return self._generate(
+                [f"Evaluate this mathematical expression: {expression}"],
+                SYSTEM_INSTRUCTION,
+                images=0,
+            )
+
+    def analyze_batch(self, images, mode="pack", pack_size=8, max_workers=4):
+        """Analyze several expressions and return their results in input order.
+
+        mode="pack" sends up to pack_size images per request and asks for a
+        JSON array back; a pack whose reply doesn't line up is re-analyzed one
+        image at a time. mode="fanout" sends one request per image concurrently.
+        """
+        images = list(images)
+        if mode == "fanout":
+            return self._fan_out(images, max_workers)
+        if mode != "pack":
+            raise ValueError(f"Unknown batch mode: {mode}")
+
+        chunks = [images[i:i + pack_size] for i in range(0, len(images), pack_size)]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            packed = list(executor.map(self._analyze_pack, chunks))
+        results = []
+        for chunk, chunk_results in zip(chunks, packed):
+            results.extend(chunk_results if chunk_results is not None else self._fan_out(chunk, max_workers))
+        return results
+
+    def _analyze_pack(self, images):
+        contents = ["Analyze the mathematical expression in each of these images."]
+        for index, image in enumerate(images, start=1):
+            contents.extend([f"Image {index}:", to_image_part(image)])
+        with telemetry.span("analyze_screen", mode="pack") as span:
+            span.set(images=len(images))
+            text = self._generate(contents, BATCH_INSTRUCTION, json_output=True, images=len(images))
+        return parse_batch_results(text or "", len(images))
+
+    def _fan_out(self, images, max_workers):
+        if len(images) <= 1:
+            return [self.analyze_screen(image) for image in images]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(images)))) as executor:
+            return list(executor.map(self.analyze_screen, images))
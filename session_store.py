@@ -0,0 +1,235 @@
+"""Pluggable storage for tutor session state shared across Streamlit workers.
+
+Backends speak a minimal Redis-style get/set/delete interface:
+
+    memory://             in-process stand-in (single worker, tests)
+    sqlite:///path.db     SQLite file shared by workers on one host
+    redis://host:6379/0   Redis, if the `redis` package is installed
+
+Values are JSON-encoded (datetimes included) and zlib-compressed when that
+makes them smaller. SessionStore loads each key lazily and keeps a
+write-through cache so repeated reads in a rerun never hit the backend, and
+unchanged values are never written back.
+
+A session is identified only by its ID, which the app keeps in the ?sid=
+URL parameter. Anyone holding a student's URL can load and overwrite that
+session, so treat those links as private.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+
+MISSING = object()
+
+_RAW = b"j"
+_COMPRESSED = b"z"
+COMPRESS_THRESHOLD = 512
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot store {type(value).__name__} in session state")
+
+
+def _object_hook(obj):
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+def encode(value):
+    """Compact bytes for a JSON-serializable value"""
+    raw = json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if len(raw) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            return _COMPRESSED + compressed
+    return _RAW + raw
+
+
+def decode(data):
+    if data[:1] == _COMPRESSED:
+        data = zlib.decompress(data[1:])
+    else:
+        data = data[1:]
+    return json.loads(data.decode("utf-8"), object_hook=_object_hook)
+
+
+class MemoryBackend:
+    """In-process stand-in for a Redis server (GET/SET EX/DEL)"""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires <= time.time():
+                del self.data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self.lock:
+            self.data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self.lock:
+            return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+
+class SQLiteBackend:
+    """SQLite key-value table behind one process-wide connection, in WAL mode for concurrent workers"""
+
+    # Seconds between sweeps of expired rows
+    PURGE_INTERVAL = 300
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        # Streamlit runs each rerun on a new thread, so the connection is shared
+        # rather than per thread, and set up once here instead of on every rerun
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_kv ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS session_kv_expires ON session_kv (expires)")
+        self.purged_at = 0.0
+        self.purge_expired()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, expires FROM session_kv WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return bytes(row[0])
+
+    def set(self, key, value, ex=None):
+        expires = time.time() + ex if ex else None
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO session_kv (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                (key, sqlite3.Binary(value), expires),
+            )
+        if time.time() - self.purged_at >= self.PURGE_INTERVAL:
+            self.purge_expired()
+        return True
+
+    def purge_expired(self):
+        """Delete rows whose TTL has passed; returns how many were removed"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.purged_at = now
+            cursor = self.conn.execute("DELETE FROM session_kv WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        return cursor.rowcount
+
+    def delete(self, *keys):
+        with self.lock, self.conn:
+            cursor = self.conn.executemany("DELETE FROM session_kv WHERE key = ?", [(k,) for k in keys])
+        return cursor.rowcount
+
+
+def backend_from_url(url):
+    """Backend for a memory://, sqlite:///path or redis:// URL"""
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://")):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for a redis:// session backend")
+        return redis.Redis.from_url(url)
+    raise ValueError(f"Unsupported session backend URL: {url}")
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(url):
+    """Process-wide backend for a URL"""
+    with _backends_lock:
+        if url not in _backends:
+            _backends[url] = backend_from_url(url)
+        return _backends[url]
+
+
+class SessionStore:
+    """Per-session view of a backend with a write-through in-process cache"""
+
+    def __init__(self, backend, session_id, ttl=None, prefix="genie"):
+        self.backend = backend
+        self.session_id = session_id
+        self.ttl = ttl
+        self.prefix = prefix
+        self.cache = {}
+        self.digests = {}
+
+    def _key(self, name):
+        return f"{self.prefix}:{self.session_id}:{name}"
+
+    def get(self, name, default=MISSING):
+        """Value of a key, loading it from the backend on first access"""
+        if name not in self.cache:
+            data = self.backend.get(self._key(name))
+            if data is None:
+                self.cache[name] = MISSING
+            else:
+                self.cache[name] = decode(data)
+                self.digests[name] = hashlib.blake2b(data, digest_size=16).digest()
+        value = self.cache[name]
+        return default if value is MISSING else value
+
+    def set(self, name, value):
+        """Write a value through to the backend unless it is unchanged"""
+        data = encode(value)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        self.cache[name] = value
+        if self.digests.get(name) == digest:
+            return False
+        self.backend.set(self._key(name), data, ex=self.ttl)
+        self.digests[name] = digest
+        return True
+
+    def delete(self, name):
+        self.cache[name] = MISSING
+        self.digests.pop(name, None)
+        self.backend.delete(self._key(name))
+
+    def sync(self, state, names):
+        """Write the given keys of a mapping such as st.session_state; returns keys written"""
+        return [name for name in names if name in state and self.set(name, state[name])]
+
+
+def backend_configured():
+    """Whether GENIE_SESSION_BACKEND asks for session state outside the worker"""
+    return bool(os.getenv("GENIE_SESSION_BACKEND"))
+
+
+def store_from_env(session_id):
+    """SessionStore for GENIE_SESSION_BACKEND, or None when sessions stay in-process"""
+    url = os.getenv("GENIE_SESSION_BACKEND")
+    if not url:
+        return None
+    ttl = os.getenv("GENIE_SESSION_TTL_SECONDS")
+    return SessionStore(get_backend(url), session_id, ttl=int(ttl) if ttl else None)
@@ -0,0 +1,263 @@
+"""Per-stage timing spans and counters.
+
+Disabled unless GENIE_TELEMETRY is set; a disabled span() returns a shared
+no-op object so instrumented code pays for one function call and a flag check.
+
+    GENIE_TELEMETRY=1          enable collection
+    GENIE_TELEMETRY_JSONL=path append every finished span to a JSONL file
+    GENIE_METRICS_PORT=9464    serve Prometheus text format on /metrics
+    GENIE_METRICS_HOST=0.0.0.0 interface for /metrics (default 127.0.0.1, local only)
+    GENIE_DEBUG_PANEL=1        show recent spans in the app sidebar
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TRUE = ("1", "true", "yes", "on")
+_FALSE = ("0", "false", "no", "off")
+
+
+def env_flag(name, default=False):
+    """Boolean GENIE_* switch; unset, empty or unrecognised values give the default"""
+    value = os.getenv(name, "").strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    return default
+
+
+ENABLED = env_flag("GENIE_TELEMETRY")
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_recent = deque(maxlen=200)
+_sinks = []
+_server = None
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def _key(name, tags):
+    return name, tuple(sorted((k, str(v)) for k, v in tags.items() if v is not None))
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times a block and records it under a stage name with label tags.
+
+    Tags become metric labels, so keep them low-cardinality (model,
+    language, task). Per-call values such as payload sizes go in fields.
+    """
+
+    def __init__(self, name, tags):
+        self.name = name
+        self.tags = tags
+        self.fields = {}
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        status = "error" if exc_type else "ok"
+        _record_span(self.name, self.tags, self.fields, duration, status)
+        return False
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+def span(name, **tags):
+    """Context manager timing one pipeline stage"""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, tags)
+
+
+def count(name, value=1, **tags):
+    """Increment a counter"""
+    if not ENABLED:
+        return
+    key = _key(name, tags)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def _record_span(name, tags, fields, duration, status):
+    key = _key("genie_stage_duration_seconds", dict(tags, stage=name, status=status))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"buckets": [0] * len(BUCKETS), "count": 0, "sum": 0.0}
+        hist["count"] += 1
+        hist["sum"] += duration
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                hist["buckets"][i] += 1
+        for field, value in fields.items():
+            if field.endswith("bytes") and isinstance(value, (int, float)):
+                bytes_key = _key(f"genie_stage_{field}_total", dict(tags, stage=name))
+                _counters[bytes_key] = _counters.get(bytes_key, 0) + value
+    event = {
+        "ts": time.time(),
+        "stage": name,
+        "duration_ms": round(duration * 1000, 3),
+        "status": status,
+        **tags,
+        **fields,
+    }
+    _recent.append(event)
+    for sink in list(_sinks):
+        try:
+            sink(event)
+        except Exception:
+            pass
+
+
+def add_sink(sink):
+    """Register a callable that receives every finished span as a dict"""
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+class JsonlSink:
+    """Appends span events to a JSONL file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str)
+        with self.lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+def recent_spans(limit=50):
+    """Most recent span events, newest first"""
+    with _lock:
+        events = list(_recent)
+    return events[::-1][:limit]
+
+
+def reset():
+    """Drop all collected metrics"""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _recent.clear()
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format"""
+    with _lock:
+        histograms = {k: {"buckets": list(v["buckets"]), "count": v["count"], "sum": v["sum"]}
+                      for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    seen = set()
+    for (name, pairs), hist in sorted(histograms.items()):
+        if name not in seen:
+            lines.append(f"# TYPE {name} histogram")
+            seen.add(name)
+        for bound, value in zip(BUCKETS, hist["buckets"]):
+            lines.append(f"{name}_bucket{_labels(pairs, [('le', repr(bound))])} {value}")
+        lines.append(f"{name}_bucket{_labels(pairs, [('le', '+Inf')])} {hist['count']}")
+        lines.append(f"{name}_sum{_labels(pairs)} {hist['sum']:.6f}")
+        lines.append(f"{name}_count{_labels(pairs)} {hist['count']}")
+    for (name, pairs), value in sorted(counters.items()):
+        if name not in seen:
+            lines.append(f"# TYPE {name} counter")
+            seen.add(name)
+        lines.append(f"{name}{_labels(pairs)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Serve /metrics on a background thread; safe to call on every rerun"""
+    global _server
+    with _lock:
+        if _server is not None:
+            return _server
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=_server.serve_forever, name="genie-metrics", daemon=True).start()
+    return _server
+
+
+def configure_from_env():
+    """Attach the JSONL sink and metrics endpoint requested by the environment"""
+    if not ENABLED:
+        return
+    path = os.getenv("GENIE_TELEMETRY_JSONL")
+    if path and not any(isinstance(s, JsonlSink) and s.path == path for s in _sinks):
+        add_sink(JsonlSink(path))
+    port = os.getenv("GENIE_METRICS_PORT")
+    if port:
+        try:
+            start_http_server(int(port), os.getenv("GENIE_METRICS_HOST", "127.0.0.1"))
+        except OSError:
+            pass
+
+
+configure_from_env()
@@ -0,0 +1,199 @@
+"""Opt-in capture of tutoring interactions for offline replay.
+
+Each interaction (a typed question, a voice turn, a canvas analysis) is
+written as one JSON line holding its inputs, model/voice parameters, the
+reply and the telemetry stages that ran on the interaction's thread with
+their durations. Canvas images and audio go to content-addressed files
+under blobs/, so a repeated drawing is stored once. Each worker process
+appends to its own trace-<pid>.jsonl; benchmarks/replay.py reads them back.
+
+    GENIE_TRACE_DIR=traces   enable capture into this directory
+    GENIE_TRACE_MEDIA=0      keep image/audio sizes only, not the bytes
+
+Capture turns telemetry on, since stage durations come from its spans.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+import telemetry
+
+FORMAT_VERSION = 1
+
+_local = threading.local()
+
+
+class Interaction:
+    """One traced interaction; stages are collected while it is open"""
+
+    def __init__(self, recorder, kind, session, params):
+        self.recorder = recorder
+        self.record = {
+            "version": FORMAT_VERSION,
+            "id": uuid.uuid4().hex,
+            "session": session,
+            "kind": kind,
+            "params": params,
+            "inputs": {},
+            "outputs": {},
+            "stages": [],
+        }
+        self.start = 0.0
+        self.previous = None
+
+    def __enter__(self):
+        self.record["started"] = time.time()
+        self.start = time.perf_counter()
+        self.previous = getattr(_local, "interaction", None)
+        _local.interaction = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.interaction = self.previous
+        self.record["duration_ms"] = round((time.perf_counter() - self.start) * 1000, 3)
+        self.record["status"] = "error" if exc_type else "ok"
+        self.recorder.write(self.record)
+        return False
+
+    def input(self, **values):
+        """Text inputs and other JSON-serializable values"""
+        self.record["inputs"].update(values)
+
+    def output(self, **values):
+        self.record["outputs"].update(values)
+
+    def blob(self, name, data, extension):
+        """Binary input such as a canvas PNG or recorded WAV"""
+        self.record["inputs"][name] = self.recorder.store_blob(data, extension)
+
+    def blob_file(self, name, path, extension=None):
+        """Binary input read from a file, if it exists"""
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                self.blob(name, f.read(), extension or os.path.splitext(path)[1].lstrip("."))
+
+    def add_stage(self, event):
+        stage = {k: v for k, v in event.items() if k != "ts"}
+        stage["end_ms"] = round((event["ts"] - self.record["started"]) * 1000, 3)
+        self.record["stages"].append(stage)
+
+
+class _NullInteraction:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def input(self, **values):
+        pass
+
+    def output(self, **values):
+        pass
+
+    def blob(self, name, data, extension):
+        pass
+
+    def blob_file(self, name, path, extension=None):
+        pass
+
+
+_NULL_INTERACTION = _NullInteraction()
+
+
+class TraceRecorder:
+    """Writes interaction records and blobs under one directory"""
+
+    def __init__(self, directory, media=True):
+        self.directory = directory
+        self.media = media
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+
+    @property
+    def path(self):
+        # Per process, so several workers never interleave partial lines
+        return os.path.join(self.directory, f"trace-{os.getpid()}.jsonl")
+
+    def store_blob(self, data, extension):
+        """Relative path of the stored blob, or just its size when media is off"""
+        if not self.media:
+            return {"bytes": len(data)}
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        name = f"blobs/{digest}.{extension}"
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp, "wb") as f:
+                f.write(data)
+            os.replace(temp, path)
+        return {"blob": name, "bytes": len(data)}
+
+    def write(self, record):
+        line = json.dumps(record, default=str, separators=(",", ":"), ensure_ascii=False)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def interaction(self, kind, session=None, **params):
+        return Interaction(self, kind, session, params)
+
+
+def _stage_sink(event):
+    current = getattr(_local, "interaction", None)
+    if current is not None:
+        current.add_stage(event)
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def start(directory, media=True):
+    """Begin capturing into a directory; safe to call on every rerun"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None or _recorder.directory != directory:
+            _recorder = TraceRecorder(directory, media=media)
+            telemetry.enable()
+            telemetry.remove_sink(_stage_sink)
+            telemetry.add_sink(_stage_sink)
+        return _recorder
+
+
+def stop():
+    global _recorder
+    with _recorder_lock:
+        _recorder = None
+        telemetry.remove_sink(_stage_sink)
+
+
+def interaction(kind, session=None, **params):
+    """Context manager tracing one interaction; a shared no-op when capture is off"""
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_INTERACTION
+    return recorder.interaction(kind, session, **params)
+
+
+def configure_from_env():
+    directory = os.getenv("GENIE_TRACE_DIR")
+    if directory:
+        start(directory, media=telemetry.env_flag("GENIE_TRACE_MEDIA", default=True))
+
+
+def load_traces(directory):
+    """All interaction records under a directory, oldest first"""
+    records = []
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("trace-") and name.endswith(".jsonl"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["started"])
+    return records
+
+
+configure_from_env()
@@ -0,0 +1,72 @@
+"""Deferred loading of heavy SDKs, clients and capability probes.
+
+The Google SDKs, PortAudio and the drawing canvas account for most of a cold
+start. Each is wrapped in a LazyResource that loads on first use, and
+warm_up() loads them on a background thread so the cost stays off the first
+page render without making the first click pay for it either.
+
+    GENIE_WARMUP=0   skip the background thread and load on first use only
+"""
+import importlib
+import threading
+from functools import lru_cache
+
+import telemetry
+
+
+class LazyResource:
+    """Value built by a zero-argument factory at most once, on first get()"""
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.value = None
+
+    def get(self):
+        if not self.loaded:
+            with self.lock:
+                if not self.loaded:
+                    with telemetry.span("load", resource=self.name):
+                        self.value = self.factory()
+                    self.loaded = True
+        return self.value
+
+
+@lru_cache(maxsize=None)
+def lazy_module(name):
+    """LazyResource that imports a module"""
+    return LazyResource(name, lambda: importlib.import_module(name))
+
+
+def warmup_enabled():
+    return telemetry.env_flag("GENIE_WARMUP", default=True)
+
+
+def _load_all(resources):
+    for resource in resources:
+        try:
+            resource.get()
+        except Exception:
+            # Left unloaded; the first real use retries and surfaces the error
+            pass
+
+
+_thread = None
+_thread_lock = threading.Lock()
+
+
+def warm_up(*resources):
+    """Load resources in order on a daemon thread; returns the thread, or None if nothing to do"""
+    global _thread
+    if not warmup_enabled():
+        return None
+    pending = [resource for resource in resources if not resource.loaded]
+    with _thread_lock:
+        # Streamlit reruns call this again while an earlier warm-up may still be running
+        if not pending or (_thread is not None and _thread.is_alive()):
+            return _thread
+        _thread = threading.Thread(target=_load_all, args=(pending,), name="genie-warmup", daemon=True)
+        _thread.start()
+        return _thread
@@ -1,7 +1,5 @@
 import streamlit as st
 import numpy as np
-from PIL import Image
-from streamlit_drawable_canvas import st_canvas
 import tempfile
 
 class Whiteboard:
@@ -35,7 +33,8 @@ class Whiteboard:
             st.session_state.selected_color = "#FFFFFF"
             st.session_state.stroke_width = 50
         
-        # Drawing canvas
+        # Drawing canvas (the component is imported on first render)
+        from streamlit_drawable_canvas import st_canvas
         canvas_result = st_canvas(
             fill_color="rgba(255, 255, 255, 0.0)",
             stroke_width=st.session_state.stroke_width,
@@ -52,6 +51,7 @@ class Whiteboard:
     def get_image(self, canvas_result):
         """Get the current canvas image as PIL Image"""
         if canvas_result.image_data is not None:
+            from PIL import Image
             return Image.fromarray((canvas_result.image_data * 255).astype(np.uint8))
         return None
     